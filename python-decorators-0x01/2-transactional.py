@@ -1,43 +1,33 @@
 # 2-transactional.py
 
-import psycopg2
 import functools
 
-#### Decorator to handle DB connection
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = psycopg2.connect(
-            dbname="users_db",
-            user="postgres",
-            password="findit",
-            host="127.0.0.1",
-            port="5432"
-        )
-        try:
-            result = func(conn, *args, **kwargs)
-        finally:
-            conn.close()
-        return result
-    return wrapper
+from db_connection import with_db_connection
 
+# Cached reads are evicted when a write to their tables commits or
+# rolls back (a read inside the transaction may have cached rows that
+# never got committed)
+cache = __import__('4-cache_query')
 
 #### Decorator to manage transactions
 def transactional(func):
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
+        tracked = cache.WriteTracker(conn)
         try:
-            result = func(conn, *args, **kwargs)
+            result = func(tracked, *args, **kwargs)
             conn.commit()   # commit if no error
             return result
         except Exception as e:
             conn.rollback() # rollback if error
             raise e
+        finally:
+            cache.query_cache.invalidate_tables(tracked.touched)
     return wrapper
 
 
 #### Function to update user email
-@with_db_connection
+@with_db_connection(dbname="users_db")
 @transactional
 def update_user_email(conn, user_id, new_email):
     cursor = conn.cursor()
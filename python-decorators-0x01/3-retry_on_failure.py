@@ -1,26 +1,7 @@
 import time
-import psycopg2
 import functools
-import os
 
-
-#### Decorator to handle PostgreSQL connection
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "alxtravel"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "findit"),
-            host=os.getenv("DB_HOST", "127.0.0.1"),
-            port=os.getenv("DB_PORT", "5432"),
-        )
-        try:
-            result = func(conn, *args, **kwargs)
-        finally:
-            conn.close()
-        return result
-    return wrapper
+from db_connection import with_db_connection
 
 
 #### Decorator to retry failed DB operations
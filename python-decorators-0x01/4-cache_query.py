@@ -1,44 +1,665 @@
 # 4-cache_query_postgres.py
 
-import psycopg2
+import base64
+import datetime
+import decimal
 import functools
+import hashlib
+import json
 import os
+import pickle
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
 
-# Simple cache dictionary
-query_cache = {}
+from db_connection import find_pool, get_pool, with_db_connection
 
+try:
+    import redis
+except ImportError:  # only needed for the shared backend
+    redis = None
 
-#### Decorator for DB connection
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "alxtravel"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "findit"),
-            host=os.getenv("DB_HOST", "127.0.0.1"),
-            port=os.getenv("DB_PORT", "5432"),
+
+#### Cache backends
+# Every backend offers lookup, get, snapshot, set, invalidate_tables,
+# clear and stats.
+# QueryCache lives in this process; RedisBackend is shared by every
+# process that points at the same Redis-compatible server.
+
+
+#### Bounded LRU cache with per-entry TTL
+class QueryCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (result, size, expires_at, stale_until)
+        self.entries = OrderedDict()
+        self.tables = {}  # key -> tables the result was read from
+        self.dependents = {}  # table -> keys of results read from it
+        self.generation = {}  # table -> number of invalidations so far
+        self.writes = 0  # invalidations of any table
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        # Returns ("fresh", result), ("stale", result) while an expired
+        # entry is still within its stale window, or ("miss", None)
+        with self.lock:
+            entry = self.entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry[3] < now:
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return "miss", None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            if entry[2] < now:
+                self.stale_hits += 1
+                return "stale", entry[0]
+            return "fresh", entry[0]
+
+    def get(self, key):
+        # Returns (True, result) on a fresh hit, (False, None) otherwise
+        state, result = self.lookup(key)
+        return (True, result) if state == "fresh" else (False, None)
+
+    def _snapshot(self, tables):
+        # Caller holds self.lock
+        tables = frozenset(tables) or frozenset([ANY_TABLE])
+        if ANY_TABLE in tables:
+            return ("writes", self.writes)
+        return tuple(sorted(
+            (table, self.generation.get(table, 0)) for table in tables | {ANY_TABLE}
+        ))
+
+    def snapshot(self, tables):
+        # Taken before running a read; set() refuses to store the result
+        # if one of its tables was invalidated in the meantime
+        with self.lock:
+            return self._snapshot(tables)
+
+    def set(self, key, result, ttl=None, tables=(), stale_ttl=0, snapshot=None):
+        size = len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return  # would evict everything else; don't cache it
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            if snapshot is not None and snapshot != self._snapshot(tables):
+                return  # a write committed while the read was running
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (result, size, expires_at, expires_at + stale_ttl)
+            self.bytes += size
+            # No recognisable table: depend on every write to be safe
+            self.tables[key] = frozenset(tables) or frozenset([ANY_TABLE])
+            for table in self.tables[key]:
+                self.dependents.setdefault(table, set()).add(key)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        size = self.entries.pop(key)[1]
+        self.bytes -= size
+        for table in self.tables.pop(key, ()):
+            keys = self.dependents.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.dependents[table]
+
+    def invalidate_tables(self, tables):
+        # Evicts every result read from one of tables
+        tables = set(tables)
+        if not tables:
+            return 0
+        with self.lock:
+            self.writes += 1
+            for table in tables:
+                self.generation[table] = self.generation.get(table, 0) + 1
+            keys = set(self.dependents.get(ANY_TABLE, ()))
+            if ANY_TABLE in tables:
+                keys.update(self.entries)
+            for table in tables:
+                keys.update(self.dependents.get(table, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tables.clear()
+            self.dependents.clear()
+            self.bytes = 0
+
+    def __contains__(self, key):
+        return self.get(key)[0]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+#### Table tracking for write-aware invalidation
+ANY_TABLE = "*"
+TABLE_PATTERN = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO|TABLE|USING|COPY)\s+(?:ONLY\s+)?([\w.\"]+)",
+    re.IGNORECASE,
+)
+# A write keyword anywhere counts, e.g. inside WITH x AS (UPDATE ...)
+WRITE_PATTERN = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|TRUNCATE|MERGE|ALTER|DROP|COPY)\b", re.IGNORECASE
+)
+# Shapes the table pattern cannot follow reliably
+COMPLEX_PATTERN = re.compile(r"\bWITH\b|\(\s*(?:SELECT|VALUES)\b", re.IGNORECASE)
+TABLE_LIST_PATTERN = re.compile(
+    r"\b(?:FROM|USING)\b(.*?)(?=\b(?:WHERE|GROUP|ORDER|LIMIT|OFFSET|HAVING|WINDOW"
+    r"|UNION|INTERSECT|EXCEPT|RETURNING|FOR|ON|SET)\b|;|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def tables_in(query):
+    # Lower-cased table names a statement reads or writes, without
+    # schema. CTEs, subqueries and comma-separated table lists are
+    # mapped to ANY_TABLE rather than risk missing a table.
+    if COMPLEX_PATTERN.search(query):
+        return {ANY_TABLE}
+    if any("," in tables for tables in TABLE_LIST_PATTERN.findall(query)):
+        return {ANY_TABLE}
+    names = {
+        name.replace('"', "").split(".")[-1].lower()
+        for name in TABLE_PATTERN.findall(query)
+    }
+    return names - {"stdin", "stdout"} or {ANY_TABLE}
+
+
+class WriteTracker:
+    # Wraps a connection and records the tables written through it
+    def __init__(self, conn):
+        self._conn = conn
+        self.touched = set()
+
+    def record(self, query):
+        if not isinstance(query, str):
+            # psycopg2.sql objects and bytes
+            as_string = getattr(query, "as_string", None)
+            query = as_string(self._conn) if as_string else str(query)
+        if WRITE_PATTERN.search(query):
+            self.touched |= tables_in(query)
+
+    def cursor(self, *args, **kwargs):
+        return TrackingCursor(self, self._conn.cursor(*args, **kwargs))
+
+    # `with conn:` inside a transactional function keeps the tracker
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class TrackingCursor:
+    def __init__(self, tracker, cursor):
+        self._tracker = tracker
+        self._cursor = cursor
+
+    def execute(self, query, vars=None):
+        self._tracker.record(query)
+        return self._cursor.execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        self._tracker.record(query)
+        return self._cursor.executemany(query, vars_list)
+
+    def copy_from(self, file, table, *args, **kwargs):
+        self._tracker.record(f"COPY {table} FROM STDIN")
+        return self._cursor.copy_from(file, table, *args, **kwargs)
+
+    def copy_expert(self, sql, file, *args, **kwargs):
+        # COPY ... TO is a read, but recording it only over-invalidates
+        self._tracker.record(sql)
+        return self._cursor.copy_expert(sql, file, *args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+#### Compact encoding for shared entries
+# Entries are tagged JSON rather than pickle: anything that can write
+# to the shared server could otherwise run code in every reader.
+COMPRESS_OVER = 1024  # bytes
+TYPE_TAG = "__type__"
+
+
+def _encode(value):
+    # JSON-ready form of a result; tuples and common column types are
+    # tagged so they round-trip with their Python type
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {TYPE_TAG: "tuple", "v": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {TYPE_TAG: "dict", "v": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, decimal.Decimal):
+        return {TYPE_TAG: "decimal", "v": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {TYPE_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {TYPE_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {TYPE_TAG: "time", "v": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {TYPE_TAG: "timedelta", "v": [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, uuid.UUID):
+        return {TYPE_TAG: "uuid", "v": str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {TYPE_TAG: "bytes", "v": base64.b64encode(bytes(value)).decode("ascii")}
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+DECODERS = {
+    "tuple": lambda v: tuple(_decode(item) for item in v),
+    "dict": lambda v: {_decode(k): _decode(item) for k, item in v},
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda v: datetime.timedelta(*v),
+    "uuid": uuid.UUID,
+    "bytes": base64.b64decode,
+}
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        return DECODERS[value[TYPE_TAG]](value["v"])
+    return value
+
+
+def dump_entry(expires_at, result):
+    # JSON [expires_at, result], zlib-compressed when that pays off
+    data = json.dumps([expires_at, _encode(result)], separators=(",", ":")).encode("utf-8")
+    if len(data) > COMPRESS_OVER:
+        packed = zlib.compress(data)
+        if len(packed) < len(data):
+            return b"z" + packed
+    return b"j" + data
+
+
+def load_entry(data):
+    if data[:1] == b"z":
+        data = zlib.decompress(data[1:])
+    else:
+        data = data[1:]
+    expires_at, result = json.loads(data)
+    return expires_at, _decode(result)
+
+
+#### Cache shared across processes through a Redis-compatible server
+# Entry and table-set names carry an epoch: a write to an unknown table
+# bumps it, which retires every entry in O(1); old names expire on
+# their own. Scripts run atomically and build key names server-side, so
+# a single (non-cluster) server is assumed.
+
+# KEYS: epoch. ARGV: prefix, digest
+LOOKUP_SCRIPT = """
+local epoch = redis.call('GET', KEYS[1]) or '0'
+return redis.call('GET', ARGV[1] .. ':entry:' .. epoch .. ':' .. ARGV[2])
+"""
+
+# KEYS: epoch, then the generation counters of the snapshot.
+# ARGV: prefix, digest, entry, keep_ms, expected generations, tables
+SET_SCRIPT = """
+local count = #KEYS - 1
+for i = 1, count do
+    if (redis.call('GET', KEYS[i + 1]) or '0') ~= ARGV[4 + i] then
+        return 0
+    end
+end
+local epoch = redis.call('GET', KEYS[1]) or '0'
+local keep = tonumber(ARGV[4])
+local name = ARGV[1] .. ':entry:' .. epoch .. ':' .. ARGV[2]
+redis.call('SET', name, ARGV[3], 'PX', keep)
+local sets = {ARGV[1] .. ':entries:' .. epoch}
+for i = 5 + count, #ARGV do
+    sets[#sets + 1] = ARGV[1] .. ':table:' .. epoch .. ':' .. ARGV[i]
+end
+for _, set in ipairs(sets) do
+    redis.call('SADD', set, name)
+    if redis.call('PTTL', set) < keep then
+        redis.call('PEXPIRE', set, keep)
+    end
+end
+return 1
+"""
+
+# KEYS: epoch, writes, invalidations. ARGV: prefix, tables
+INVALIDATE_SCRIPT = """
+local epoch = redis.call('GET', KEYS[1]) or '0'
+local any = false
+for i = 2, #ARGV do
+    redis.call('INCR', ARGV[1] .. ':gen:' .. ARGV[i])
+    if ARGV[i] == '*' then any = true end
+end
+redis.call('INCR', KEYS[2])
+local removed = 0
+if any then
+    removed = redis.call('SCARD', ARGV[1] .. ':entries:' .. epoch)
+    redis.call('INCR', KEYS[1])
+else
+    local sets = {ARGV[1] .. ':table:' .. epoch .. ':*'}
+    for i = 2, #ARGV do
+        sets[#sets + 1] = ARGV[1] .. ':table:' .. epoch .. ':' .. ARGV[i]
+    end
+    local names = redis.call('SUNION', unpack(sets))
+    for i = 1, #names, 1000 do
+        removed = removed + redis.call('DEL', unpack(names, i, math.min(i + 999, #names)))
+    end
+    redis.call('DEL', unpack(sets))
+end
+redis.call('INCRBY', KEYS[3], removed)
+return removed
+"""
+
+
+class RedisBackend:
+    def __init__(self, url="redis://localhost:6379/0", ttl=300, prefix="query_cache"):
+        if redis is None:
+            raise ImportError("redis is required for the shared cache backend")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lookup = self.client.register_script(LOOKUP_SCRIPT)
+        self._set = self.client.register_script(SET_SCRIPT)
+        self._invalidate = self.client.register_script(INVALIDATE_SCRIPT)
+
+    def _name(self, *parts):
+        return ":".join((self.prefix,) + parts)
+
+    def _digest(self, key):
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _count(self, counter):
+        self.client.incr(self._name("stats", counter))
+
+    def lookup(self, key):
+        # An unreachable server is a miss, not an error
+        try:
+            data = self._lookup(keys=[self._name("epoch")],
+                                args=[self.prefix, self._digest(key)])
+            if data is None:
+                self._count("misses")
+                return "miss", None
+            expires_at, result = load_entry(data)
+            self._count("hits")
+            if expires_at < time.time():
+                self._count("stale_hits")
+                return "stale", result
+            return "fresh", result
+        except redis.RedisError as e:
+            print(f"⚠️ Query cache unavailable: {e}")
+            return "miss", None
+
+    def get(self, key):
+        state, result = self.lookup(key)
+        return (True, result) if state == "fresh" else (False, None)
+
+    def _generation_names(self, tables):
+        tables = frozenset(tables) or frozenset([ANY_TABLE])
+        if ANY_TABLE in tables:
+            return [self._name("writes")]
+        return [self._name("gen", table) for table in sorted(tables | {ANY_TABLE})]
+
+    def snapshot(self, tables):
+        # Generation counters before a read; set() compares them again
+        # atomically with the write of the entry
+        try:
+            values = self.client.mget(self._generation_names(tables))
+        except redis.RedisError:
+            return None
+        return [(value or b"0").decode("ascii") for value in values]
+
+    def set(self, key, result, ttl=None, tables=(), stale_ttl=0, snapshot=None):
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            entry = dump_entry(time.time() + ttl, result)
+        except TypeError:
+            return  # a column type the shared encoding does not know
+        tables = frozenset(tables) or frozenset([ANY_TABLE])
+        # Redis drops the entry once its stale window is over too, and
+        # keeps each table set at least that long
+        keep_ms = max(1, int((ttl + stale_ttl) * 1000))
+        generations = [] if snapshot is None else self._generation_names(tables)
+        try:
+            self._set(
+                keys=[self._name("epoch")] + generations,
+                args=[self.prefix, self._digest(key), entry, keep_ms]
+                     + list(snapshot or ()) + sorted(tables),
+            )
+        except redis.RedisError as e:
+            print(f"⚠️ Could not cache result: {e}")
+
+    def invalidate_tables(self, tables):
+        tables = set(tables)
+        if not tables:
+            return 0
+        try:
+            return self._invalidate(
+                keys=[self._name("epoch"), self._name("writes"),
+                      self._name("stats", "invalidations")],
+                args=[self.prefix] + sorted(tables),
+            )
+        except redis.RedisError as e:
+            print(f"⚠️ Could not invalidate cached results: {e}")
+            return 0
+
+    def clear(self):
+        try:
+            self.client.incr(self._name("epoch"))
+        except redis.RedisError as e:
+            print(f"⚠️ Could not clear cached results: {e}")
+
+    def stats(self):
+        # Values are None when the server cannot report them
+        counters = ("hits", "stale_hits", "misses", "invalidations")
+        try:
+            values = self.client.mget([self._name("stats", c) for c in counters])
+            stats = {c: int(v or 0) for c, v in zip(counters, values)}
+        except redis.RedisError as e:
+            print(f"⚠️ Query cache stats unavailable: {e}")
+            return dict.fromkeys(counters + ("bytes",))
+        try:
+            stats["bytes"] = self.client.info("memory").get("used_memory")
+        except redis.RedisError:
+            stats["bytes"] = None  # e.g. INFO disabled on managed servers
+        return stats
+
+
+def make_query_cache():
+    # QUERY_CACHE_BACKEND=memory (default) or redis, configured from
+    # the QUERY_CACHE_* environment variables
+    ttl = float(os.getenv("QUERY_CACHE_TTL", "300"))
+    backend = os.getenv("QUERY_CACHE_BACKEND", "memory")
+    if backend == "redis":
+        return RedisBackend(
+            url=os.getenv("QUERY_CACHE_URL", "redis://localhost:6379/0"),
+            ttl=ttl,
         )
+    if backend != "memory":
+        raise ValueError(f"Unknown QUERY_CACHE_BACKEND: {backend}")
+    return QueryCache(
+        max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.getenv("QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        ttl=ttl,
+    )
+
+
+# Shared result cache, picked and sized from the environment
+query_cache = make_query_cache()
+
+
+def cache_key(conn, query, args, kwargs):
+    # Same query text against another database or with other
+    # parameters is a different result
+    target = getattr(conn, "dsn", None)
+    key = (target, query, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)  # e.g. list parameters
+    return key
+
+
+#### Single-flight: one execution per key, shared by concurrent callers
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+in_flight = {}
+in_flight_lock = threading.Lock()
+
+
+def _fly(key, flight, compute):
+    # Runs compute() for the flight registered under key
+    try:
+        flight.result = compute()
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with in_flight_lock:
+            del in_flight[key]
+        flight.done.set()
+
+
+def single_flight(key, compute):
+    # The first caller for key runs compute(); callers arriving while
+    # it runs wait for it and share its result (or its exception)
+    with in_flight_lock:
+        flight = in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = in_flight[key] = Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    return _fly(key, flight, compute)
+
+
+def refresh_in_background(key, compute):
+    # Starts compute() on a daemon thread unless key is already in
+    # flight. The flight is registered before the lock is released, so
+    # two stale readers cannot both start a refresh.
+    with in_flight_lock:
+        if key in in_flight:
+            return False
+        flight = in_flight[key] = Flight()
+
+    def run():
+        try:
+            _fly(key, flight, compute)
+        except Exception as e:
+            print(f"⚠️ Background refresh failed: {e}")
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
+
+
+def leased(pool, func):
+    # func(conn) over a connection leased from pool for the call
+    def run():
+        conn = pool.acquire()
         try:
-            result = func(conn, *args, **kwargs)
+            return func(conn)
         finally:
-            conn.close()
-        return result
-    return wrapper
+            pool.release(conn)
+    return run
 
 
 #### Decorator to cache queries
-def cache_query(func):
-    @functools.wraps(func)
-    def wrapper(conn, query, *args, **kwargs):
-        if query in query_cache:
-            print(f"⚡ Using cached result for query: {query}")
-            return query_cache[query]
-        print(f"🆕 Executing and caching query: {query}")
-        result = func(conn, query, *args, **kwargs)
-        query_cache[query] = result
-        return result
-    return wrapper
+# Concurrent misses on the same key share one execution. With
+# stale_ttl > 0 an expired result keeps being served for stale_ttl more
+# seconds while a background thread refreshes it over a pooled
+# connection to the same database as the caller's; without such a pool
+# the caller refreshes it in place instead.
+def cache_query(func=None, ttl=None, stale_ttl=0):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(conn, query, *args, **kwargs):
+            key = cache_key(conn, query, args, kwargs)
+            state, result = query_cache.lookup(key)
+            if state == "fresh":
+                print(f"⚡ Using cached result for query: {query}")
+                return result
+
+            tables = tables_in(query)
+
+            def execute(conn):
+                snapshot = query_cache.snapshot(tables)
+                result = func(conn, query, *args, **kwargs)
+                query_cache.set(key, result, ttl, tables, stale_ttl, snapshot)
+                return result
+
+            pool = find_pool(getattr(conn, "dsn", None)) if state == "stale" else None
+            if pool is not None:
+                print(f"♻️ Using stale result and refreshing query: {query}")
+                refresh_in_background(key, leased(pool, execute))
+                return result
+
+            print(f"🆕 Executing and caching query: {query}")
+            return single_flight(key, lambda: execute(conn))
+        return wrapper
+
+    # Works both as @cache_query and @cache_query(ttl=...)
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 
 #### Function with caching
@@ -59,3 +680,6 @@ if __name__ == "__main__":
     # Second call uses cache
     users_again = fetch_users_with_cache(query="SELECT * FROM users")
     print(users_again)
+
+    print(query_cache.stats())
+    print(get_pool().stats())
@@ -0,0 +1,206 @@
+# db_connection.py
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+import psycopg2.pool
+
+
+#### Thread-safe PostgreSQL connection pool
+class ConnectionPool:
+    def __init__(self, minconn=1, maxconn=10, idle_timeout=300,
+                 validate_after=30, timeout=30, **settings):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.idle_timeout = idle_timeout      # close idle connections after this
+        self.validate_after = validate_after  # SELECT 1 when idle this long
+        self.timeout = timeout                # max seconds to wait for a lease
+        self.settings = settings
+        self.dsn = None      # as reported by the connections, password masked
+        self.idle = deque()  # (conn, returned_at), most recent on the right
+        self.size = 0        # open connections, idle or leased
+        self.cond = threading.Condition()
+        self.leases = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        for _ in range(minconn):
+            self.idle.append((self._connect(), time.monotonic()))
+            self.size += 1
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.settings)
+        self.dsn = conn.dsn
+        return conn
+
+    def _valid(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if idle_for < self.validate_after:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        # Caller holds self.cond
+        self.size -= 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self.cond.notify()
+
+    def _reap_idle(self, now):
+        # Close connections idle longer than idle_timeout, keeping minconn
+        while (self.idle and self.size > self.minconn
+               and now - self.idle[0][1] > self.idle_timeout):
+            self._discard(self.idle.popleft()[0])
+
+    def _take(self, deadline, waited):
+        # Pops an idle connection or reserves a slot for a new one (None)
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self._reap_idle(now)
+                if self.idle:
+                    return self.idle.pop(), waited
+                if self.size < self.maxconn:
+                    self.size += 1
+                    return None, waited
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                if now >= deadline:
+                    self.timeouts += 1
+                    raise psycopg2.pool.PoolError("timed out waiting for a connection")
+                self.cond.wait(deadline - now)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        wait_time = 0.0  # time spent waiting for the lock or a free slot
+        while True:
+            started = time.monotonic()
+            candidate, waited = self._take(deadline, waited)
+            wait_time += time.monotonic() - started
+            if candidate is None:
+                conn = None
+                break
+            # Validate outside the lock: SELECT 1 is a network round trip
+            conn, returned_at = candidate
+            if self._valid(conn, time.monotonic() - returned_at):
+                break
+            with self.cond:
+                self._discard(conn)
+        with self.cond:
+            self._record_wait(wait_time)
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self.cond:
+                    self.size -= 1
+                    self.cond.notify()
+                raise
+        return conn
+
+    def _record_wait(self, waited):
+        # Caller holds self.cond
+        self.leases += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def release(self, conn):
+        # Reset transaction and session state before the next lease
+        try:
+            if not conn.closed:
+                conn.reset()  # rolls back and runs RESET ALL
+                conn.autocommit = False
+        except psycopg2.Error:
+            pass
+        with self.cond:
+            if conn.closed:
+                self._discard(conn)
+                return
+            self.idle.append((conn, time.monotonic()))
+            self.cond.notify()
+
+    def stats(self):
+        with self.cond:
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "leases": self.leases,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": 1000 * self.wait_total / self.leases if self.leases else 0.0,
+                "wait_max_ms": 1000 * self.wait_max,
+            }
+
+    def close_all(self):
+        with self.cond:
+            while self.idle:
+                self._discard(self.idle.popleft()[0])
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(dbname=None):
+    # Process-wide pool per database, configured from the environment
+    # on first use; dbname defaults to DB_NAME
+    dbname = dbname or os.getenv("DB_NAME", "alxtravel")
+    with _pool_lock:
+        if dbname not in _pools:
+            _pools[dbname] = ConnectionPool(
+                minconn=int(os.getenv("DB_POOL_MIN", "1")),
+                maxconn=int(os.getenv("DB_POOL_MAX", "10")),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+                validate_after=float(os.getenv("DB_POOL_VALIDATE_AFTER", "30")),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                dbname=dbname,
+                user=os.getenv("DB_USER", "postgres"),
+                password=os.getenv("DB_PASSWORD", "findit"),
+                host=os.getenv("DB_HOST", "127.0.0.1"),
+                port=os.getenv("DB_PORT", "5432"),
+            )
+        return _pools[dbname]
+
+
+def find_pool(dsn):
+    # The open pool whose connections have this dsn, if any
+    with _pool_lock:
+        pools = list(_pools.values())
+    return next((pool for pool in pools if dsn and pool.dsn == dsn), None)
+
+
+#### Decorator to handle DB connection
+# Works both as @with_db_connection and @with_db_connection(dbname=...)
+def with_db_connection(func=None, dbname=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            pool = get_pool(dbname)
+            conn = pool.acquire()
+            try:
+                result = func(conn, *args, **kwargs)
+            finally:
+                pool.release(conn)
+            return result
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
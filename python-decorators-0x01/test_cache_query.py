@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Unit tests for the in-process QueryCache of 4-cache_query."""
+
+import types
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+
+cache = __import__('4-cache_query')
+
+
+class TestQueryCache(unittest.TestCase):
+    """Unit tests for QueryCache LRU, TTL and table invalidation."""
+
+    def setUp(self):
+        """Drive the cache from a fake monotonic clock."""
+        self.now = 0.0
+        clock = types.SimpleNamespace(monotonic=lambda: self.now)
+        patcher = patch.object(cache, "time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_then_fresh_hit(self):
+        """Test a stored result is returned until it expires."""
+        query_cache = cache.QueryCache(ttl=10)
+        self.assertEqual(query_cache.lookup("k"), ("miss", None))
+        query_cache.set("k", [(1, "a")])
+        self.assertEqual(query_cache.lookup("k"), ("fresh", [(1, "a")]))
+        self.assertEqual((query_cache.hits, query_cache.misses), (1, 1))
+
+    def test_expired_entry_is_dropped(self):
+        """Test an entry past its ttl is a miss and frees its bytes."""
+        query_cache = cache.QueryCache(ttl=10)
+        query_cache.set("k", [1])
+        self.now = 10.5
+        self.assertEqual(query_cache.lookup("k"), ("miss", None))
+        self.assertEqual(query_cache.bytes, 0)
+
+    def test_stale_window(self):
+        """Test an expired entry is served as stale within stale_ttl."""
+        query_cache = cache.QueryCache(ttl=10)
+        query_cache.set("k", [1], stale_ttl=5)
+        self.now = 12
+        self.assertEqual(query_cache.lookup("k"), ("stale", [1]))
+        self.assertEqual(query_cache.get("k"), (False, None))
+        self.now = 16
+        self.assertEqual(query_cache.lookup("k"), ("miss", None))
+
+    def test_lru_eviction_by_count(self):
+        """Test the least recently used entry goes first."""
+        query_cache = cache.QueryCache(max_entries=2)
+        query_cache.set("a", 1)
+        query_cache.set("b", 2)
+        query_cache.lookup("a")  # b is now least recently used
+        query_cache.set("c", 3)
+        self.assertEqual(list(query_cache.entries), ["a", "c"])
+        self.assertEqual(query_cache.evictions, 1)
+
+    def test_eviction_by_bytes(self):
+        """Test entries are evicted to stay within max_bytes."""
+        query_cache = cache.QueryCache(max_bytes=300)
+        for key in "abcdef":
+            query_cache.set(key, "x" * 100)
+        self.assertLessEqual(query_cache.bytes, 300)
+        self.assertIn("f", query_cache.entries)
+        self.assertNotIn("a", query_cache.entries)
+
+    def test_oversized_result_is_not_cached(self):
+        """Test a result larger than max_bytes is skipped."""
+        query_cache = cache.QueryCache(max_bytes=50)
+        query_cache.set("k", "x" * 100)
+        self.assertEqual(query_cache.lookup("k"), ("miss", None))
+
+    def test_invalidate_tables(self):
+        """Test a write evicts results of its tables and of unknown tables."""
+        query_cache = cache.QueryCache()
+        query_cache.set("users", 1, tables={"users"})
+        query_cache.set("orders", 2, tables={"orders"})
+        query_cache.set("unknown", 3)
+        self.assertEqual(query_cache.invalidate_tables({"users"}), 2)
+        self.assertEqual(list(query_cache.entries), ["orders"])
+        self.assertEqual(query_cache.dependents, {"orders": {"orders"}})
+
+    def test_invalidate_any_table(self):
+        """Test an unparseable write evicts everything."""
+        query_cache = cache.QueryCache()
+        query_cache.set("users", 1, tables={"users"})
+        query_cache.set("orders", 2, tables={"orders"})
+        self.assertEqual(query_cache.invalidate_tables({cache.ANY_TABLE}), 2)
+        self.assertEqual(len(query_cache.entries), 0)
+
+    @parameterized.expand([
+        ({"users"}, {"users"}, False),
+        ({"users"}, {"orders"}, True),
+        ({"users"}, {cache.ANY_TABLE}, False),
+        (set(), {"orders"}, False),
+    ])
+    def test_set_after_concurrent_write(self, read, written, stored):
+        """Test a read is only stored if none of its tables changed since."""
+        query_cache = cache.QueryCache()
+        snapshot = query_cache.snapshot(read)
+        query_cache.invalidate_tables(written)
+        query_cache.set("k", 1, tables=read, snapshot=snapshot)
+        self.assertEqual("k" in query_cache.entries, stored)
+
+
+class TestTablesIn(unittest.TestCase):
+    """Unit tests for tables_in and write detection."""
+
+    @parameterized.expand([
+        ("SELECT * FROM users WHERE id = %s", {"users"}),
+        ("SELECT * FROM public.users u JOIN orders o ON o.uid = u.id", {"users", "orders"}),
+        ("SELECT * FROM users u, orders o", {cache.ANY_TABLE}),
+        ("SELECT * FROM users WHERE id IN (SELECT uid FROM orders)", {cache.ANY_TABLE}),
+        ("WITH x AS (SELECT 1) SELECT * FROM x", {cache.ANY_TABLE}),
+        ("SELECT 1", {cache.ANY_TABLE}),
+        ("COPY users (name) FROM STDIN", {"users"}),
+    ])
+    def test_tables_in(self, query, expected):
+        """Test table extraction falls back to ANY_TABLE when unsure."""
+        self.assertEqual(cache.tables_in(query), expected)
+
+    @parameterized.expand([
+        ("UPDATE users SET email = %s", True),
+        ("WITH x AS (DELETE FROM users RETURNING *) SELECT * FROM x", True),
+        ("SELECT * FROM users", False),
+    ])
+    def test_write_detection(self, query, is_write):
+        """Test writes are found anywhere in the statement."""
+        self.assertEqual(bool(cache.WRITE_PATTERN.search(query)), is_write)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Unit tests for the ConnectionPool of db_connection."""
+
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+import psycopg2
+import psycopg2.pool
+import db_connection
+from db_connection import ConnectionPool
+
+
+class FakeCursor:
+    """Cursor whose SELECT 1 fails when the connection is broken."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query):
+        """Run the health check."""
+        self.conn.checks += 1
+        self.conn.pool_lock_held.append(self.conn.lock_probe())
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+
+    def close(self):
+        """Nothing to release."""
+
+
+class FakeConnection:
+    """psycopg2 connection stand-in counting what the pool does to it."""
+
+    def __init__(self, lock_probe, **settings):
+        self.settings = settings
+        self.dsn = "dbname={}".format(settings.get("dbname"))
+        self.lock_probe = lock_probe
+        self.closed = 0
+        self.broken = False
+        self.checks = 0
+        self.resets = 0
+        self.autocommit = True
+        self.pool_lock_held = []
+
+    def cursor(self):
+        """Return a FakeCursor."""
+        return FakeCursor(self)
+
+    def rollback(self):
+        """Nothing to roll back."""
+
+    def reset(self):
+        """Record the reset done on release."""
+        self.resets += 1
+
+    def close(self):
+        """Mark the connection closed."""
+        self.closed = 1
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Unit tests for ConnectionPool with a fake psycopg2.connect."""
+
+    def setUp(self):
+        """Replace psycopg2.connect with FakeConnection."""
+        self.opened = []
+        self.pool = None
+
+        def connect(**settings):
+            conn = FakeConnection(self.lock_held, **settings)
+            self.opened.append(conn)
+            return conn
+
+        patcher = patch.object(db_connection.psycopg2, "connect", connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def lock_held(self):
+        """Whether another thread could take the pool lock right now."""
+        if not self.pool.cond.acquire(blocking=False):
+            return True
+        self.pool.cond.release()
+        return False
+
+    def make_pool(self, **options):
+        """Build the pool under test."""
+        self.pool = ConnectionPool(dbname="test", **options)
+        return self.pool
+
+    def test_minconn_opened_up_front(self):
+        """Test minconn connections are opened when the pool is built."""
+        pool = self.make_pool(minconn=2, maxconn=5)
+        self.assertEqual((pool.size, len(pool.idle)), (2, 2))
+        self.assertEqual(self.opened[0].settings, {"dbname": "test"})
+        self.assertEqual(pool.dsn, "dbname=test")
+
+    def test_lease_reuses_most_recent_connection(self):
+        """Test a released connection is handed out again."""
+        pool = self.make_pool(minconn=0, maxconn=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_release_resets_session(self):
+        """Test release() resets the connection and autocommit."""
+        pool = self.make_pool(minconn=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertEqual(conn.resets, 1)
+        self.assertFalse(conn.autocommit)
+
+    def test_closed_connection_is_not_pooled(self):
+        """Test a connection closed while leased frees its slot."""
+        pool = self.make_pool(minconn=0, maxconn=1)
+        conn = pool.acquire()
+        conn.close()
+        pool.release(conn)
+        self.assertEqual((pool.size, len(pool.idle)), (0, 0))
+        self.assertIsNot(pool.acquire(), conn)
+
+    @parameterized.expand([(1,), (3,)])
+    def test_maxconn_bound(self, maxconn):
+        """Test no more than maxconn connections are ever open."""
+        pool = self.make_pool(minconn=0, maxconn=maxconn, timeout=5)
+        leased = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(20):
+                conn = pool.acquire()
+                with lock:
+                    leased.append(conn)
+                    peak.append(len(leased))
+                time.sleep(0.001)
+                with lock:
+                    leased.remove(conn)
+                pool.release(conn)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(max(peak), maxconn)
+        self.assertLessEqual(len(self.opened), maxconn)
+        self.assertEqual(pool.stats()["leases"], 160)
+        self.assertGreater(pool.stats()["waits"], 0)
+
+    def test_lease_timeout(self):
+        """Test a full pool raises PoolError after timeout seconds."""
+        pool = self.make_pool(minconn=0, maxconn=1, timeout=0.05)
+        pool.acquire()
+        started = time.monotonic()
+        with self.assertRaises(psycopg2.pool.PoolError):
+            pool.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(pool.stats()["waits"], 1)
+
+    def test_waiter_gets_released_connection(self):
+        """Test a blocked acquire() wakes up when a lease is returned."""
+        pool = self.make_pool(minconn=0, maxconn=1, timeout=5)
+        conn = pool.acquire()
+        threading.Timer(0.05, pool.release, args=(conn,)).start()
+        self.assertIs(pool.acquire(), conn)
+        stats = pool.stats()
+        self.assertGreaterEqual(stats["wait_max_ms"], 40)
+        self.assertGreater(stats["wait_avg_ms"], 0)
+
+    def test_idle_reaped_down_to_minconn(self):
+        """Test connections idle past idle_timeout close, keeping minconn."""
+        pool = self.make_pool(minconn=1, maxconn=4, idle_timeout=60)
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+        clock = types.SimpleNamespace(monotonic=lambda: time.monotonic() + 61)
+        with patch.object(db_connection, "time", clock):
+            conn = pool.acquire()
+        # the two oldest idle connections are closed; the minconn one is leased
+        self.assertEqual(sum(c.closed for c in self.opened), 2)
+        self.assertIs(conn, conns[-1])
+        self.assertEqual(pool.size, 1)
+        pool.release(conn)
+
+    def test_validation_runs_outside_the_lock(self):
+        """Test SELECT 1 runs on connections idle past validate_after, unlocked."""
+        pool = self.make_pool(minconn=0, validate_after=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(conn.checks, 1)
+        self.assertEqual(conn.pool_lock_held, [False])
+
+    def test_recently_used_connection_is_not_validated(self):
+        """Test no SELECT 1 for connections idle less than validate_after."""
+        pool = self.make_pool(minconn=0, validate_after=30)
+        conn = pool.acquire()
+        pool.release(conn)
+        pool.acquire()
+        self.assertEqual(conn.checks, 0)
+
+    def test_invalid_connection_is_discarded(self):
+        """Test a connection failing validation is closed and replaced."""
+        pool = self.make_pool(minconn=0, maxconn=1, validate_after=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.broken = True
+        replacement = pool.acquire()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.size, 1)
+
+    def test_close_all(self):
+        """Test close_all closes every idle connection."""
+        pool = self.make_pool(minconn=3)
+        pool.close_all()
+        self.assertTrue(all(conn.closed for conn in self.opened))
+        self.assertEqual(pool.size, 0)
+
+
+class TestWithDbConnection(unittest.TestCase):
+    """Unit tests for get_pool and with_db_connection."""
+
+    def setUp(self):
+        """Start from an empty pool registry with fake connections."""
+        patcher = patch.object(db_connection, "_pools", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        connect = patch.object(
+            db_connection.psycopg2, "connect",
+            lambda **settings: FakeConnection(lambda: False, **settings),
+        )
+        connect.start()
+        self.addCleanup(connect.stop)
+
+    def test_one_pool_per_database(self):
+        """Test pools are shared per dbname and findable by dsn."""
+        self.assertIs(db_connection.get_pool("a"), db_connection.get_pool("a"))
+        self.assertIsNot(db_connection.get_pool("a"), db_connection.get_pool("b"))
+        self.assertIs(db_connection.find_pool("dbname=b"), db_connection.get_pool("b"))
+        self.assertIsNone(db_connection.find_pool("dbname=c"))
+
+    @parameterized.expand([("bare",), ("dbname",)])
+    def test_decorator_leases_and_releases(self, form):
+        """Test the decorated function gets a connection that is then returned."""
+        def target(conn, value):
+            return conn.settings["dbname"], value
+
+        with patch.dict("os.environ", {"DB_NAME": "default_db"}):
+            if form == "bare":
+                func = db_connection.with_db_connection(target)
+                expected = "default_db"
+            else:
+                func = db_connection.with_db_connection(dbname="users_db")(target)
+                expected = "users_db"
+            self.assertEqual(func(value=1), (expected, 1))
+            pool = db_connection.get_pool(expected)
+        self.assertEqual(len(pool.idle), pool.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
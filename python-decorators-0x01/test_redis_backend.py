@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Unit tests for the shared RedisBackend of 4-cache_query."""
+
+import datetime
+import decimal
+import unittest
+import uuid
+from unittest.mock import patch
+from parameterized import parameterized
+
+try:
+    import fakeredis
+except ImportError:  # the Lua scripts also need lupa
+    fakeredis = None
+
+cache = __import__('4-cache_query')
+
+
+@unittest.skipIf(fakeredis is None or cache.redis is None,
+                 "fakeredis and redis are required")
+class TestRedisBackend(unittest.TestCase):
+    """Unit tests for RedisBackend against an in-memory fakeredis."""
+
+    def setUp(self):
+        """Build a backend on a private fakeredis server."""
+        server = fakeredis.FakeServer()
+        with patch.object(cache.redis.Redis, "from_url",
+                          lambda url: fakeredis.FakeRedis(server=server)):
+            self.backend = cache.RedisBackend(ttl=60)
+        self.client = self.backend.client
+
+    def store(self, key, tables, result=None):
+        """set() key with a snapshot taken just before."""
+        snapshot = self.backend.snapshot(tables)
+        self.backend.set(key, result or [(key,)], tables=tables, snapshot=snapshot)
+
+    def test_miss_then_hit(self):
+        """Test a stored result is returned fresh."""
+        self.assertEqual(self.backend.lookup("k"), ("miss", None))
+        self.store("k", {"users"})
+        self.assertEqual(self.backend.lookup("k"), ("fresh", [("k",)]))
+        self.assertEqual(self.backend.stats()["hits"], 1)
+        self.assertEqual(self.backend.stats()["misses"], 1)
+
+    def test_expired_entry_is_stale(self):
+        """Test an entry past its ttl is served as stale in its window."""
+        self.backend.set("k", [1], ttl=0, tables={"users"}, stale_ttl=60)
+        self.assertEqual(self.backend.lookup("k"), ("stale", [1]))
+
+    @parameterized.expand([
+        ({"users"}, {"users"}, False),
+        ({"users"}, {"orders"}, True),
+        ({"users"}, {cache.ANY_TABLE}, False),
+        (set(), {"orders"}, False),
+    ])
+    def test_set_rejects_stale_snapshot(self, read, written, stored):
+        """Test a read is dropped if one of its tables changed since its snapshot."""
+        snapshot = self.backend.snapshot(read)
+        self.backend.invalidate_tables(written)
+        self.backend.set("k", [1], tables=read, snapshot=snapshot)
+        self.assertEqual(self.backend.lookup("k")[0] == "fresh", stored)
+
+    def test_invalidate_tables(self):
+        """Test a write evicts its tables' results and unknown-table results."""
+        self.store("users", {"users"})
+        self.store("orders", {"orders"})
+        self.store("unknown", set())
+        self.assertEqual(self.backend.invalidate_tables({"users"}), 2)
+        self.assertEqual(self.backend.lookup("users")[0], "miss")
+        self.assertEqual(self.backend.lookup("unknown")[0], "miss")
+        self.assertEqual(self.backend.lookup("orders")[0], "fresh")
+        self.assertEqual(self.backend.stats()["invalidations"], 2)
+
+    def test_invalidate_any_table_retires_epoch(self):
+        """Test an unknown-table write retires every entry without a SCAN."""
+        self.store("users", {"users"})
+        self.store("orders", {"orders"})
+        old = set(self.client.keys("query_cache:entry:0:*"))
+        self.assertEqual(self.backend.invalidate_tables({cache.ANY_TABLE}), 2)
+        self.assertEqual(self.client.get("query_cache:epoch"), b"1")
+        self.assertEqual(self.backend.lookup("users")[0], "miss")
+        self.assertEqual(self.backend.lookup("orders")[0], "miss")
+        # the old names are left to expire on their own
+        self.assertEqual(set(self.client.keys("query_cache:entry:0:*")), old)
+        self.store("users", {"users"})
+        self.assertEqual(self.backend.lookup("users")[0], "fresh")
+
+    def test_clear_retires_epoch(self):
+        """Test clear() drops every entry."""
+        self.store("users", {"users"})
+        self.backend.clear()
+        self.assertEqual(self.backend.lookup("users")[0], "miss")
+
+    def test_table_sets_expire(self):
+        """Test table sets live at least as long as their longest entry."""
+        self.backend.set("short", [1], ttl=10, tables={"users"})
+        self.backend.set("long", [1], ttl=100, tables={"users"}, stale_ttl=20)
+        self.backend.set("shorter", [1], ttl=5, tables={"users"})
+        ttl = self.client.pttl("query_cache:table:0:users")
+        self.assertGreater(ttl, 110 * 1000)
+        self.assertLessEqual(ttl, 120 * 1000)
+
+    def test_unsupported_type_is_not_cached(self):
+        """Test values the JSON encoding cannot tag are skipped."""
+        self.backend.set("k", [object()], tables={"users"})
+        self.assertEqual(self.backend.lookup("k")[0], "miss")
+
+    def test_unreachable_server_degrades(self):
+        """Test Redis errors turn into misses and empty stats."""
+        backend = cache.RedisBackend(url="redis://localhost:1/0")
+        self.assertEqual(backend.lookup("k"), ("miss", None))
+        backend.set("k", [1], tables={"users"})
+        self.assertEqual(backend.invalidate_tables({"users"}), 0)
+        backend.clear()
+        self.assertIsNone(backend.stats()["hits"])
+
+
+class TestEntryEncoding(unittest.TestCase):
+    """Unit tests for dump_entry and load_entry."""
+
+    @parameterized.expand([
+        ("tuple", [(1, "a", None, True)]),
+        ("decimal", [(decimal.Decimal("12.50"),)]),
+        ("date", (datetime.date(2024, 2, 29), datetime.time(13, 5, 7))),
+        ("datetime", [datetime.datetime(2024, 1, 2, 3, 4, 5,
+                                        tzinfo=datetime.timezone.utc)]),
+        ("timedelta", datetime.timedelta(days=2, seconds=3)),
+        ("uuid", (uuid.UUID("12345678-1234-5678-1234-567812345678"),)),
+        ("bytes", [(b"\x00\xff",)]),
+        ("dict", {"name": ("a", 1)}),
+        ("none", None),
+    ])
+    def test_round_trip(self, _, result):
+        """Test results come back with their Python types."""
+        expires_at, loaded = cache.load_entry(cache.dump_entry(123.5, result))
+        self.assertEqual(expires_at, 123.5)
+        self.assertEqual(loaded, result)
+        self.assertEqual(type(loaded), type(result))
+
+    def test_large_entries_are_compressed(self):
+        """Test entries above COMPRESS_OVER are zlib-compressed."""
+        result = [("x" * 100,)] * 100
+        data = cache.dump_entry(0, result)
+        self.assertEqual(data[:1], b"z")
+        self.assertEqual(cache.load_entry(data)[1], result)
+
+    def test_no_pickle(self):
+        """Test entries are JSON, never pickle."""
+        data = cache.dump_entry(0, [(1,)])
+        self.assertEqual(data[:1], b"j")
+        self.assertEqual(data[1:], b'[0,[{"__type__":"tuple","v":[1]}]]')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for request coalescing in 4-cache_query."""
+
+import threading
+import time
+import unittest
+
+cache = __import__('4-cache_query')
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Unit tests for single_flight and refresh_in_background."""
+
+    def run_flights(self, compute, callers):
+        """Start a leader, then callers - 1 more once its flight is running."""
+        started = threading.Event()
+        outcomes = []
+
+        def leader_compute():
+            started.set()
+            return compute()
+
+        def call(func):
+            try:
+                outcomes.append(("ok", cache.single_flight("k", func)))
+            except ValueError as e:
+                outcomes.append(("error", str(e)))
+
+        threads = [threading.Thread(target=call, args=(leader_compute,))]
+        threads[0].start()
+        started.wait(2)
+        threads += [threading.Thread(target=call, args=(compute,))
+                    for _ in range(callers - 1)]
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)  # let the followers reach single_flight
+        return threads, outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test callers arriving during a flight wait for its result."""
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(2)
+            return "rows"
+
+        threads, outcomes = self.run_flights(compute, 8)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outcomes, [("ok", "rows")] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.in_flight, {})
+
+    def test_waiters_get_leaders_error(self):
+        """Test an exception in the leader reaches every waiter."""
+        release = threading.Event()
+
+        def compute():
+            release.wait(2)
+            raise ValueError("boom")
+
+        threads, outcomes = self.run_flights(compute, 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outcomes, [("error", "boom")] * 3)
+        self.assertEqual(cache.in_flight, {})
+
+    def test_sequential_calls_run_again(self):
+        """Test a finished flight is not reused."""
+        calls = []
+        cache.single_flight("k", lambda: calls.append(1))
+        cache.single_flight("k", lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+    def test_one_background_refresh_per_key(self):
+        """Test a second refresh for a key in flight is not started."""
+        release = threading.Event()
+        done = threading.Event()
+
+        def compute():
+            release.wait(2)
+            done.set()
+
+        self.assertTrue(cache.refresh_in_background("k", compute))
+        self.assertFalse(cache.refresh_in_background("k", compute))
+        release.set()
+        done.wait(2)
+        while cache.in_flight:
+            pass
+        self.assertTrue(cache.refresh_in_background("k", lambda: None))
+
+    def test_caller_waits_for_background_refresh(self):
+        """Test a miss during a background refresh shares its result."""
+        release = threading.Event()
+        self.assertTrue(cache.refresh_in_background(
+            "k", lambda: release.wait(2) and "new"
+        ))
+        timer = threading.Timer(0.05, release.set)
+        timer.start()
+        self.assertEqual(cache.single_flight("k", lambda: "own"), "new")
+        timer.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,27 +4,39 @@ Generator function that streams rows from user_data table one by one.
 """
 
 import psycopg2
-from seed import connect_to_prodev
+from connection_pool import connect_to_prodev
+from user_rows import row_builder
 
-def stream_users():
+
+def stream_users(server_side=True, itersize=2000, row_format="dict"):
     """
     Generator that yields each row from user_data as a dictionary.
     No more than one loop is used.
+
+    With server_side=True the rows are read through a named (server-side)
+    cursor that fetches itersize rows per round trip, so client memory
+    stays flat no matter how big the table is. server_side=False keeps
+    the old client-side cursor. row_format picks "dict", "record" or
+    "tuple" rows (see user_rows).
     """
+    build = row_builder(row_format)
     connection = connect_to_prodev()
     if not connection:
         return
 
-    cursor = connection.cursor()
-    cursor.execute("SELECT user_id, name, email, age FROM user_data;")
+    if server_side:
+        # Named cursors only exist inside a transaction
+        connection.autocommit = False
+        cursor = connection.cursor(name="stream_users_cursor")
+        cursor.itersize = itersize
+    else:
+        cursor = connection.cursor()
 
-    for row in cursor:
-        yield {
-            "user_id": row[0],
-            "name": row[1],
-            "email": row[2],
-            "age": row[3]
-        }
+    try:
+        cursor.execute("SELECT user_id, name, email, age FROM user_data;")
 
-    cursor.close()
-    connection.close()
+        for row in cursor:
+            yield build(row)
+    finally:
+        cursor.close()
+        connection.close()
@@ -1,47 +1,169 @@
 #!/usr/bin/python3
 
-from seed import connect_to_prodev
+import operator
 
-def stream_users_in_batches(batch_size):
+from connection_pool import connect_to_prodev
+from keyset_pagination import compile_filters, keyset_pages
+from user_rows import row_builder
+from read_ahead import read_ahead
+from checkpoint import as_checkpoint
+
+try:
+    import numpy as np
+except ImportError:  # columnar mode is optional
+    np = None
+
+COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def stream_users_in_batches(batch_size, filters=None, row_format="dict",
+                            prefetch=0, checkpoint=None, checkpoint_every=1,
+                            resume=False):
     """
     Generator that fetches rows from user_data in batches of batch_size.
+    Batches are read with keyset pagination, so each query costs the
+    same no matter how far into the table it is. batch_size may be an
+    AdaptiveBatchSize to let the size follow the measured throughput.
+
+    filters is a list of (field, operator, value) tuples, compiled into
+    the WHERE clause of the batch query, and/or callables taking a user
+    row, which are applied in Python to the rows that come back.
+    row_format picks "dict", "record" or "tuple" rows (see user_rows).
+    With prefetch > 0, up to prefetch batches are fetched ahead on a
+    background thread while the current batch is being yielded.
+
+    checkpoint (a file path or a checkpoint object, see checkpoint.py)
+    records the last user_id of every checkpoint_every-th batch once the
+    consumer has moved past it, and is cleared when the stream ends.
+    With resume=True the stream starts after the stored user_id.
     """
+    build = row_builder(row_format)
+    condition, params, python_filters = compile_filters(filters)
+    checkpoint = as_checkpoint(checkpoint)
+    last_seen = checkpoint.load() if checkpoint and resume else None
     connection = connect_to_prodev()
     if not connection:
         return
 
-    cursor = connection.cursor()
-    offset = 0
+    pages = keyset_pages(connection, batch_size, last_seen, condition, params)
+    if prefetch:
+        pages = read_ahead(pages, prefetch)
+    try:
+        for batches, rows in enumerate(pages, start=1):
+            for row in rows:
+                user = build(row)
+                if all(keep(user) for keep in python_filters):
+                    yield user
+            # The consumer asked for more, so this batch is processed
+            if checkpoint and batches % checkpoint_every == 0:
+                checkpoint.save(rows[-1][0])
+        if checkpoint:
+            checkpoint.clear()
+    finally:
+        # Stop the read-ahead thread before its connection goes away
+        pages.close()
+        connection.close()
+
+
+# dtype of each user_data column in a columnar batch
+COLUMN_TYPES = (
+    ("user_id", object),
+    ("name", object),
+    ("email", object),
+    ("age", np.int64 if np is not None else None),
+)
+
+
+def to_columns(rows):
+    """
+    Turns a batch of user_data row tuples into a dict of NumPy arrays,
+    one per column. age is an int64 array; the rest are object arrays.
+    Each array is filled straight from the rows, without transposing
+    the batch into Python tuples first.
+    """
+    return {
+        name: np.fromiter(map(operator.itemgetter(i), rows), dtype=dtype, count=len(rows))
+        for i, (name, dtype) in enumerate(COLUMN_TYPES)
+    }
+
+
+def to_rows(columns, row_format="dict"):
+    """
+    Turns a columns dict back into rows in the row-mode format, with
+    plain Python values (tolist() converts NumPy scalars).
+    """
+    build = row_builder(row_format)
+    return map(build, zip(*(columns[name].tolist() for name, _ in COLUMN_TYPES)))
+
+
+def where(field, op, value):
+    """
+    Builds a vectorized predicate: a callable that takes a columns dict
+    and returns a boolean mask, e.g. where("age", ">", 25).
+    Predicates can be combined with & and | on the masks they return.
+    """
+    compare = COMPARISONS[op]
+    return lambda columns: compare(columns[field], value)
 
-    while True:
-        cursor.execute(
-            "SELECT user_id, name, email, age FROM user_data ORDER BY user_id LIMIT %s OFFSET %s;",
-            (batch_size, offset)
-        )
-        rows = cursor.fetchall()
-        if not rows:
-            break
-        for row in rows:
-            yield {
-                "user_id": row[0],
-                "name": row[1],
-                "email": row[2],
-                "age": row[3]
-            }
-        offset += batch_size
 
-    cursor.close()
-    connection.close()
+def stream_user_columns(batch_size, predicate=None, filters=None):
+    """
+    Generator that yields each batch of user_data as a dict of NumPy
+    arrays, keeping only the rows for which predicate's mask is True.
+    Batches left empty by the predicate are skipped. filters are
+    (field, operator, value) tuples pushed down into the batch query.
+    """
+    if np is None:
+        raise ImportError("numpy is required for columnar batches")
 
+    condition, params, python_filters = compile_filters(filters)
+    if python_filters:
+        raise ValueError("Use predicate for filters that are not SQL")
 
-def batch_processing(batch_size):
+    connection = connect_to_prodev()
+    if not connection:
+        return
+
+    try:
+        for rows in keyset_pages(connection, batch_size, None, condition, params):
+            columns = to_columns(rows)
+            if predicate is not None:
+                mask = predicate(columns)
+                if not mask.any():
+                    continue
+                columns = {name: values[mask] for name, values in columns.items()}
+            yield columns
+    finally:
+        connection.close()
+
+
+def batch_processing(batch_size, columnar=False, checkpoint=None, resume=False):
     """
     Processes users in batches and prints only those older than 25.
+    With columnar=True each batch is filtered as NumPy arrays and the
+    kept rows are printed in the same format as the row mode.
+    checkpoint and resume make the run resumable after a crash
+    (see stream_users_in_batches); they apply to the row mode.
     """
+    if columnar:
+        for columns in stream_user_columns(batch_size, where("age", ">", 25)):
+            for user in to_rows(columns):
+                print(user)
+        return
+
     batch = []
-    for user in stream_users_in_batches(batch_size):
-        if user["age"] > 25:
-            batch.append(user)
+    # The age filter runs in the database, so younger users are never fetched
+    users = stream_users_in_batches(batch_size, [("age", ">", 25)],
+                                    checkpoint=checkpoint, resume=resume)
+    for user in users:
+        batch.append(user)
         if len(batch) == batch_size:
             for u in batch:
                 print(u)
@@ -1,6 +1,17 @@
 #!/usr/bin/python3
 
-from seed import connect_to_prodev
+from connection_pool import connect_to_prodev
+from keyset_pagination import fetch_page_after, keyset_pages
+from user_rows import row_builder
+
+
+def _to_users(rows):
+    """Turns user_data row tuples into a list of dictionaries."""
+    return [
+        {"user_id": row[0], "name": row[1], "email": row[2], "age": row[3]}
+        for row in rows
+    ]
+
 
 def paginate_users(page_size, offset):
     """
@@ -9,25 +20,50 @@ def paginate_users(page_size, offset):
     """
     connection = connect_to_prodev()
     cursor = connection.cursor()
-    cursor.execute(f"SELECT * FROM user_data LIMIT {page_size} OFFSET {offset}")
+    cursor.execute(
+        "SELECT * FROM user_data ORDER BY user_id LIMIT %s OFFSET %s",
+        (page_size, offset)
+    )
     rows = cursor.fetchall()
     cursor.close()
     connection.close()
-    return [
-        {"user_id": row[0], "name": row[1], "email": row[2], "age": row[3]}
-        for row in rows
-    ]
+    return _to_users(rows)
 
 
-def lazy_pagination(page_size):
+def paginate_users_after(page_size, last_seen=None):
+    """
+    Fetches the page of users that follows user_id last_seen
+    (keyset pagination). Returns a list of dictionaries.
+    """
+    connection = connect_to_prodev()
+    cursor = connection.cursor()
+    rows = fetch_page_after(cursor, last_seen, page_size)
+    cursor.close()
+    connection.close()
+    return _to_users(rows)
+
+
+def lazy_pagination(page_size, connection=None, row_format="dict"):
     """
     Generator that lazily yields each page of users one by one.
     Uses only one loop.
+
+    A single connection is held for the whole walk and closed once the
+    pages run out, the generator is closed or it is garbage collected.
+    A connection passed in by the caller is used as is and left open.
+    row_format picks "dict", "record" or "tuple" rows (see user_rows).
+    page_size may be an AdaptiveBatchSize (see adaptive_batch).
     """
-    offset = 0
-    while True:
-        page = paginate_users(page_size, offset)
-        if not page:
-            break
-        yield page
-        offset += page_size
+    build = row_builder(row_format)
+    owns_connection = connection is None
+    if owns_connection:
+        connection = connect_to_prodev()
+        if not connection:
+            return
+
+    try:
+        for rows in keyset_pages(connection, page_size):
+            yield [build(row) for row in rows]
+    finally:
+        if owns_connection:
+            connection.close()
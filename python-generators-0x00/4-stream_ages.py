@@ -1,31 +1,88 @@
 #!/usr/bin/python3
 
-from seed import connect_to_prodev
+from connection_pool import connect_to_prodev
 
-def stream_user_ages():
+AGGREGATES = ("avg", "count", "sum", "min", "max")
+
+
+def stream_user_ages(itersize=2000):
     """
     Generator that yields user ages one by one from the database.
+    Ages are read through a server-side cursor, itersize at a time.
     """
     connection = connect_to_prodev()
+    # Named cursors only exist inside a transaction
+    connection.autocommit = False
+    cursor = connection.cursor(name="stream_user_ages_cursor")
+    cursor.itersize = itersize
+    try:
+        cursor.execute("SELECT age FROM user_data;")
+        for row in cursor:
+            yield row[0]  # only yield the age
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _aggregate_in_sql(names):
+    """Lets PostgreSQL compute the aggregates in a single query."""
+    connection = connect_to_prodev()
     cursor = connection.cursor()
-    cursor.execute("SELECT age FROM user_data;")
-    for row in cursor.fetchall():
-        yield row[0]  # only yield the age
+    columns = ", ".join(f"{name.upper()}(age)" for name in names)
+    cursor.execute(f"SELECT {columns} FROM user_data;")
+    row = cursor.fetchone()
     cursor.close()
     connection.close()
+    return dict(zip(names, row))
 
 
-def calculate_average_age():
-    """
-    Calculates the average age using the generator without loading all data into memory.
-    """
-    total = 0
+def _aggregate_streaming(names):
+    """Computes the aggregates in one pass over stream_user_ages()."""
     count = 0
-    for age in stream_user_ages():  # first loop over generator
-        total += age
+    total = 0
+    smallest = None
+    largest = None
+    for age in stream_user_ages():
         count += 1
+        total += age
+        if smallest is None or age < smallest:
+            smallest = age
+        if largest is None or age > largest:
+            largest = age
+
+    results = {
+        "avg": total / count if count else None,
+        "count": count,
+        "sum": total if count else None,
+        "min": smallest,
+        "max": largest,
+    }
+    return {name: results[name] for name in names}
+
+
+def aggregate_ages(names=AGGREGATES, push_down=True):
+    """
+    Returns a dict of the requested aggregates (any of avg, count, sum,
+    min, max) over user ages. With push_down=True PostgreSQL computes
+    them; otherwise the ages are streamed and aggregated in Python
+    without being held in memory. Like SQL, avg, sum, min and max are
+    None for an empty table.
+    """
+    names = tuple(name.lower() for name in names)
+    unknown = [name for name in names if name not in AGGREGATES]
+    if unknown:
+        raise ValueError(f"Unsupported aggregate(s): {', '.join(unknown)}")
+    if push_down:
+        return _aggregate_in_sql(names)
+    return _aggregate_streaming(names)
+
 
-    average = total / count if count > 0 else 0
+def calculate_average_age(push_down=False):
+    """
+    Calculates the average age using the generator without loading all data into memory.
+    Pass push_down=True to let the database compute it instead.
+    """
+    average = aggregate_ages(("avg",), push_down=push_down)["avg"] or 0
     print(f"Average age of users: {average:.2f}")
 
 
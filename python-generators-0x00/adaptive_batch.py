@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Adaptive batch sizing for the keyset batch generators.
+
+Pass an AdaptiveBatchSize wherever a batch_size or page_size is taken
+by stream_users_in_batches or lazy_pagination. It starts small so the
+first rows arrive quickly, then sizes every following batch from the
+measured time and memory per row, aiming at target_seconds per batch
+and never more than max_bytes of rows per batch.
+"""
+
+import sys
+
+
+def row_bytes(row):
+    """Approximate memory held by one row tuple and its values."""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+class AdaptiveBatchSize:
+    """Batch size controller tuned from the batches it has seen."""
+
+    def __init__(self, initial=100, minimum=10, maximum=100000,
+                 target_seconds=0.25, max_bytes=64 * 1024 * 1024,
+                 max_growth=2.0):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.max_growth = max_growth
+
+    def next_size(self):
+        """Size to request for the next batch."""
+        return self.size
+
+    def record(self, rows, seconds):
+        """Updates the size from a fetched batch and how long it took."""
+        if not rows:
+            return
+        seconds_per_row = seconds / len(rows)
+        bytes_per_row = row_bytes(rows[0])
+
+        by_latency = (self.target_seconds / seconds_per_row
+                      if seconds_per_row > 0 else self.maximum)
+        by_memory = self.max_bytes / bytes_per_row
+        wanted = min(by_latency, by_memory, self.size * self.max_growth)
+        self.size = int(max(self.minimum, min(self.maximum, wanted)))
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+Async generator counterparts of stream_users, stream_users_in_batches
+and lazy_pagination, backed by asyncpg.
+
+Pages are read with keyset pagination and the next page is requested
+as soon as the current one is handed out, so the database round trip
+overlaps with whatever the consumer does with the current page. asyncpg
+runs one operation per connection at a time, so this prefetch is only
+done on connections the generators open themselves.
+"""
+
+import asyncio
+import re
+
+from connection_pool import db_settings
+from keyset_pagination import build_page_query, compile_filters
+from user_rows import row_builder
+
+try:
+    import asyncpg
+except ImportError:  # only needed for the async API
+    asyncpg = None
+
+
+async def async_connect_to_prodev():
+    """Connect to ALX_prodev database with asyncpg."""
+    if asyncpg is None:
+        raise ImportError("asyncpg is required for the async generators")
+    settings = db_settings()
+    settings["port"] = int(settings["port"])
+    return await asyncpg.connect(**settings)
+
+
+def _numbered(query):
+    """Turns the %s placeholders of query into asyncpg's $1, $2, ..."""
+    counter = iter(range(1, query.count("%s") + 1))
+    return re.sub("%s", lambda _: f"${next(counter)}", query)
+
+
+def _async_row_builder(row_format):
+    """row_builder for asyncpg Records: "tuple" rows become real tuples."""
+    if row_format == "tuple":
+        return tuple
+    return row_builder(row_format)
+
+
+async def async_keyset_pages(connection, page_size, condition="", params=(),
+                             prefetch=True):
+    """
+    Async generator that yields pages of user_data records in user_id
+    order. With prefetch=True page N+1 is fetched while page N is being
+    consumed, which requires the connection to be used by nothing else
+    until the generator is done.
+    """
+    async def fetch(last_seen):
+        query, args = build_page_query(last_seen, page_size, condition, params)
+        return await connection.fetch(_numbered(query), *args)
+
+    pending = asyncio.ensure_future(fetch(None))
+    try:
+        while pending is not None:
+            rows = await pending
+            pending = None
+            if not rows:
+                break
+            last_seen = rows[-1][0] if len(rows) == page_size else None
+            if prefetch and last_seen is not None:
+                pending = asyncio.ensure_future(fetch(last_seen))
+            yield rows
+            if not prefetch and last_seen is not None:
+                pending = asyncio.ensure_future(fetch(last_seen))
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+async def async_stream_users(batch_size=2000, row_format="dict"):
+    """
+    Async generator that yields each row from user_data, reading
+    batch_size rows per round trip.
+    """
+    async for user in async_stream_users_in_batches(batch_size, None, row_format):
+        yield user
+
+
+async def async_stream_users_in_batches(batch_size, filters=None, row_format="dict"):
+    """
+    Async generator that fetches rows from user_data in batches of
+    batch_size and yields them one by one. filters work as in
+    stream_users_in_batches.
+    """
+    build = _async_row_builder(row_format)
+    condition, params, python_filters = compile_filters(filters)
+    connection = await async_connect_to_prodev()
+    try:
+        async for rows in async_keyset_pages(connection, batch_size, condition, params):
+            for row in rows:
+                user = build(row)
+                if all(keep(user) for keep in python_filters):
+                    yield user
+    finally:
+        await connection.close()
+
+
+async def async_lazy_pagination(page_size, connection=None, row_format="dict"):
+    """
+    Async generator that lazily yields each page of users. A connection
+    passed in by the caller is used as is and left open; pages are not
+    prefetched on it, so the caller may run its own queries on it
+    between pages.
+    """
+    build = _async_row_builder(row_format)
+    owns_connection = connection is None
+    if owns_connection:
+        connection = await async_connect_to_prodev()
+    try:
+        async for rows in async_keyset_pages(connection, page_size,
+                                             prefetch=owns_connection):
+            yield [build(row) for row in rows]
+    finally:
+        if owns_connection:
+            await connection.close()
+
+
+if __name__ == "__main__":
+    async def main():
+        async for page in async_lazy_pagination(100):
+            for user in page:
+                print(user)
+
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""
+Benchmark suite for the user_data generators.
+
+Optionally (re)seeds ALX_prodev with synthetic users through seed.py,
+then runs stream_users, stream_users_in_batches, lazy_pagination and
+stream_user_ages, each in its own process, and reports time to first
+row, rows/sec, peak RSS, the number of statements executed and the
+number of server round trips (statements plus the FETCHes of
+server-side cursors). Results are printed and saved as JSON so runs
+can be compared in CI.
+
+Usage: ./bench_generators.py [--seed ROWS] [--batch-size N] [--output FILE]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import uuid
+
+import psycopg2.extensions
+
+import connection_pool
+import seed
+
+BENCHMARKS = ("stream_users", "stream_users_in_batches",
+              "lazy_pagination", "stream_user_ages")
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """
+    Cursor that counts the statements it executes and, for named
+    (server-side) cursors, every FETCH it sends to the server.
+    """
+
+    executed = 0
+    fetches = 0
+
+    def execute(self, query, vars=None):
+        CountingCursor.executed += 1
+        return super().execute(query, vars)
+
+    def _fetched(self):
+        if self.name is not None:
+            CountingCursor.fetches += 1
+
+    def fetchone(self):
+        self._fetched()
+        return super().fetchone()
+
+    def fetchmany(self, size=None):
+        self._fetched()
+        return super().fetchmany(self.arraysize if size is None else size)
+
+    def fetchall(self):
+        self._fetched()
+        return super().fetchall()
+
+    def __iter__(self):
+        if self.name is None:
+            return super().__iter__()
+        return self._iter_named()
+
+    def _iter_named(self):
+        # psycopg2 iterates named cursors itersize rows per FETCH in C;
+        # do the same through fetchmany so each FETCH is counted
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+
+def _counting_connect(connect):
+    """Wraps connect_to_prodev so its connections use CountingCursor."""
+    def connect_to_prodev():
+        connection = connect()
+        if connection:
+            connection.cursor_factory = CountingCursor
+        return connection
+    return connect_to_prodev
+
+
+def synthetic_users(count):
+    """Yields count (user_id, name, email, age) rows."""
+    for i in range(count):
+        yield (str(uuid.uuid4()), f"User {i}", f"user{i}@example.com", 18 + i % 80)
+
+
+def seed_users(count):
+    """Recreates user_data with count synthetic users."""
+    connection = seed.connect_db()
+    seed.create_database(connection)
+    connection.close()
+
+    connection = seed.connect_to_prodev()
+    seed.create_table(connection)
+    cursor = connection.cursor()
+    cursor.execute("TRUNCATE user_data;")
+    cursor.close()
+    _, inserted = seed.copy_users(connection, synthetic_users(count))
+    cursor = connection.cursor()
+    cursor.execute("ANALYZE user_data;")
+    cursor.close()
+    connection.close()
+    print(f"Seeded {inserted} users")
+
+
+def _rows(name, batch_size):
+    """Returns an iterator of single rows for the named generator."""
+    if name == "stream_users":
+        return __import__('0-stream_users').stream_users()
+    if name == "stream_users_in_batches":
+        return __import__('1-batch_processing').stream_users_in_batches(batch_size)
+    if name == "lazy_pagination":
+        pages = __import__('2-lazy_paginate').lazy_pagination(batch_size)
+        return (user for page in pages for user in page)
+    if name == "stream_user_ages":
+        return __import__('4-stream_ages').stream_user_ages()
+    raise ValueError(f"Unknown benchmark: {name}")
+
+
+def _run(name, batch_size, results):
+    """Child process: runs one generator to exhaustion and measures it."""
+    connection_pool.connect_to_prodev = _counting_connect(
+        connection_pool.connect_to_prodev
+    )
+
+    started = time.perf_counter()
+    first_row = None
+    count = 0
+    for _ in _rows(name, batch_size):
+        if first_row is None:
+            first_row = time.perf_counter() - started
+        count += 1
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024
+    results.put({
+        "benchmark": name,
+        "rows": count,
+        "seconds": elapsed,
+        "time_to_first_row": first_row,
+        "rows_per_sec": count / elapsed if elapsed else 0,
+        "peak_rss_bytes": peak,
+        "statements": CountingCursor.executed,
+        "round_trips": CountingCursor.executed + CountingCursor.fetches,
+    })
+
+
+def run_benchmark(name, batch_size):
+    """Runs one benchmark in a fresh process and returns its results."""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run, args=(name, batch_size, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the user generators")
+    parser.add_argument("--seed", type=int, metavar="ROWS",
+                        help="truncate user_data and seed ROWS synthetic users")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", default="bench_generators.json")
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS))
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        seed_users(args.seed)
+
+    report = {
+        "python": platform.python_version(),
+        "batch_size": args.batch_size,
+        "results": [],
+    }
+    for name in args.benchmarks:
+        result = run_benchmark(name, args.batch_size)
+        report["results"].append(result)
+        first_row = result["time_to_first_row"] or 0
+        print(f"{name:>24}: {result['rows']} rows, "
+              f"first row {first_row * 1000:.1f} ms, "
+              f"{result['rows_per_sec']:.0f} rows/sec, "
+              f"peak RSS {result['peak_rss_bytes'] / 2**20:.1f} MiB, "
+              f"{result['statements']} statements, "
+              f"{result['round_trips']} round trips")
+
+    with open(args.output, mode="w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {args.output}")
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Benchmark of per-page latency for lazy pagination: a fresh, unpooled
+connection per page against one connection held for the whole walk
+(lazy_pagination).
+
+Usage: ./bench_lazy_paginate.py [page_size] [pages]
+"""
+
+import sys
+import time
+
+import seed
+from keyset_pagination import fetch_page_after
+
+lazy_paginate = __import__('2-lazy_paginate')
+
+
+def per_connection_pages(page_size):
+    """
+    Old behaviour: a new connection for every page. seed.connect_to_prodev
+    opens a direct psycopg2 connection, so each page pays the full
+    connection handshake rather than a pool checkout.
+    """
+    last_seen = None
+    while True:
+        connection = seed.connect_to_prodev()
+        try:
+            cursor = connection.cursor()
+            rows = fetch_page_after(cursor, last_seen, page_size)
+            cursor.close()
+        finally:
+            connection.close()
+        if not rows:
+            break
+        yield lazy_paginate._to_users(rows)
+        last_seen = rows[-1][0]
+
+
+def time_pages(pages, limit):
+    """Returns the latency in milliseconds of each of the first limit pages."""
+    latencies = []
+    start = time.perf_counter()
+    for page in pages:
+        now = time.perf_counter()
+        latencies.append((now - start) * 1000)
+        if len(latencies) == limit:
+            break
+        start = time.perf_counter()
+    pages.close()
+    return latencies
+
+
+def report(label, latencies):
+    """Prints mean and worst page latency."""
+    if not latencies:
+        print(f"{label}: no pages")
+        return
+    mean = sum(latencies) / len(latencies)
+    print(f"{label}: {len(latencies)} pages, "
+          f"mean {mean:.3f} ms/page, max {max(latencies):.3f} ms")
+
+
+if __name__ == "__main__":
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    report("connection per page",
+           time_pages(per_connection_pages(page_size), limit))
+    report("shared connection",
+           time_pages(lazy_paginate.lazy_pagination(page_size), limit))
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmark of the row representations in user_rows: memory per row and
+rows/sec, both for building rows from synthetic tuples and, with --db,
+for streaming user_data through stream_users.
+
+Usage: ./bench_row_formats.py [rows] [--db]
+"""
+
+import sys
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+
+from user_rows import ROW_FORMATS, row_builder
+
+
+def synthetic_rows(count):
+    """Row tuples shaped like the ones psycopg2 returns for user_data."""
+    return [
+        (str(uuid.uuid4()), f"User {i}", f"user{i}@example.com", Decimal(i % 100))
+        for i in range(count)
+    ]
+
+
+def measure_build(row_format, rows):
+    """Returns (bytes per row, rows/sec) for building rows in row_format."""
+    build = row_builder(row_format)
+
+    tracemalloc.start()
+    built = [build(row) for row in rows]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Subtract the list holding the rows, which every format pays
+    per_row = max(current - sys.getsizeof(built), 0) / len(rows)
+    del built
+
+    start = time.perf_counter()
+    for row in rows:
+        build(row)
+    elapsed = time.perf_counter() - start
+    return per_row, len(rows) / elapsed if elapsed else 0
+
+
+def measure_stream(row_format):
+    """Returns rows/sec for streaming user_data in row_format."""
+    stream_users = __import__('0-stream_users').stream_users
+    count = 0
+    start = time.perf_counter()
+    for _ in stream_users(row_format=row_format):
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed else 0
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--db"]
+    count = int(args[0]) if args else 100000
+    rows = synthetic_rows(count)
+
+    for row_format in ROW_FORMATS:
+        per_row, rate = measure_build(row_format, rows)
+        line = f"{row_format:>6}: {per_row:7.1f} bytes/row, {rate:12.0f} rows/sec built"
+        if "--db" in sys.argv:
+            line += f", {measure_stream(row_format):10.0f} rows/sec streamed"
+        print(line)
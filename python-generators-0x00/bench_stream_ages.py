@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""
+Benchmark of the age aggregates computed in SQL against computed from a
+streamed server-side cursor. Seed user_data with the row count you want
+to measure (e.g. 10M rows) before running it.
+
+Usage: ./bench_stream_ages.py [repeats]
+"""
+
+import sys
+import time
+
+stream_ages = __import__('4-stream_ages')
+
+
+def time_mode(push_down, repeats):
+    """Returns the best wall time in seconds and the last result."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = stream_ages.aggregate_ages(push_down=push_down)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    for label, push_down in (("push-down (SQL)", True),
+                             ("streaming (Python)", False)):
+        elapsed, result = time_mode(push_down, repeats)
+        rate = result["count"] / elapsed if elapsed else 0
+        print(f"{label}: {elapsed:.3f}s best of {repeats}, "
+              f"{rate:.0f} rows/sec, {result}")
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Checkpoints for resumable streaming jobs.
+
+A checkpoint stores the last user_id a job has fully processed, so a
+restarted job can continue with keyset pagination right after it.
+Every checkpoint has load() (None when there is nothing to resume),
+save(key) and clear().
+"""
+
+import os
+
+
+class FileCheckpoint:
+    """Checkpoint kept in a local file, replaced atomically on save."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def save(self, key):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as file:
+            file.write(str(key))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class TableCheckpoint:
+    """Checkpoint kept in the stream_checkpoints table, one row per job."""
+
+    def __init__(self, connection, job):
+        self.connection = connection
+        self.job = job
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stream_checkpoints (
+                job VARCHAR(255) PRIMARY KEY,
+                last_key UUID NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+        cursor.close()
+
+    def load(self):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT last_key FROM stream_checkpoints WHERE job = %s;", (self.job,)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        return str(row[0]) if row else None
+
+    def save(self, key):
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT INTO stream_checkpoints (job, last_key) VALUES (%s, %s)
+            ON CONFLICT (job)
+            DO UPDATE SET last_key = EXCLUDED.last_key, updated_at = now();
+        """, (self.job, str(key)))
+        cursor.close()
+
+    def clear(self):
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM stream_checkpoints WHERE job = %s;", (self.job,))
+        cursor.close()
+
+
+def as_checkpoint(checkpoint):
+    """Accepts a checkpoint object or a file path; returns a checkpoint."""
+    if checkpoint is None or hasattr(checkpoint, "save"):
+        return checkpoint
+    return FileCheckpoint(checkpoint)
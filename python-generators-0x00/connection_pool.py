@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+"""
+Process-wide connection pool for the ALX_prodev generators.
+
+connect_to_prodev() here has the same contract as seed.connect_to_prodev
+(an autocommit connection, or None when connecting fails) but checks the
+connection out of a pool; calling close() on it hands it back instead of
+disconnecting. Settings come from the environment:
+
+    DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+    DB_POOL_MIN, DB_POOL_MAX       pool size (default 1 and 10)
+    DB_POOL_TIMEOUT                seconds to wait for a free connection
+    DB_POOL_CHECK_AFTER            idle seconds before a checkout runs
+                                   a SELECT 1 health check
+"""
+
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import pool
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def db_settings():
+    """Connection parameters for ALX_prodev, read from the environment."""
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": os.getenv("DB_PORT", "5432"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", "findit"),
+        "database": os.getenv("DB_NAME", "ALX_prodev"),
+    }
+
+
+class PooledConnection:
+    """
+    Wraps a pooled psycopg2 connection. Everything is delegated to the
+    real connection except close(), which returns it to the pool.
+    """
+
+    def __init__(self, owner, connection):
+        object.__setattr__(self, "_owner", owner)
+        object.__setattr__(self, "_connection", connection)
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
+
+    def close(self):
+        if self._connection is not None:
+            self._owner.release(self._connection)
+            object.__setattr__(self, "_connection", None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Thread-safe pool with a bounded wait and health checks on checkout."""
+
+    def __init__(self, minconn, maxconn, timeout=30, check_after=30, **settings):
+        self._pool = pool.ThreadedConnectionPool(minconn, maxconn, **settings)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        self.timeout = timeout
+        self.check_after = check_after
+
+    def _healthy(self, connection):
+        if connection.closed:
+            return False
+        idle = time.monotonic() - self._last_used.get(id(connection), 0)
+        if idle < self.check_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1;")
+            cursor.close()
+            connection.rollback()  # autocommit can only change outside a transaction
+            return True
+        except psycopg2.Error:
+            return False
+
+    def acquire(self):
+        """Checks out a healthy autocommit connection."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pool.PoolError("timed out waiting for a free connection")
+        try:
+            while True:
+                connection = self._pool.getconn()
+                if self._healthy(connection):
+                    connection.autocommit = True
+                    return PooledConnection(self, connection)
+                # Drop the broken connection; getconn opens a new one
+                self._last_used.pop(id(connection), None)
+                self._pool.putconn(connection, close=True)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        """Resets a connection and returns it to the pool."""
+        try:
+            if not connection.closed:
+                connection.rollback()
+                connection.autocommit = True
+                connection.cursor_factory = None
+            self._last_used[id(connection)] = time.monotonic()
+            self._pool.putconn(connection, close=bool(connection.closed))
+        except psycopg2.Error:
+            self._last_used.pop(id(connection), None)
+            self._pool.putconn(connection, close=True)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self._pool.closeall()
+
+
+def get_pool():
+    """Returns the pool of this process, creating it on first use."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A forked child must not share its parent's sockets
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                int(os.getenv("DB_POOL_MIN", "1")),
+                int(os.getenv("DB_POOL_MAX", "10")),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                check_after=float(os.getenv("DB_POOL_CHECK_AFTER", "30")),
+                **db_settings()
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def connect_to_prodev():
+    """Check out a connection to ALX_prodev database from the pool."""
+    try:
+        return get_pool().acquire()
+    except Exception as e:
+        print(f"Error connecting to ALX_prodev: {e}")
+        return None
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Bounded-memory streaming deduplication for the seed ingest pipeline.
+
+A Bloom filter answers "definitely new" for almost every unseen key
+without touching anything else. Only when it answers "maybe seen" is
+the exact set consulted. The exact set keeps recent keys in memory and
+spills them to an on-disk SQLite table once it holds max_items keys, so
+memory stays bounded however large the input is.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over str keys."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.size = max(8, int(bits))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+
+class SpillingSet:
+    """Exact set of str keys that moves to disk above max_items in memory."""
+
+    def __init__(self, max_items=1_000_000, directory=None):
+        self.max_items = max_items
+        self.directory = directory
+        self.memory = set()
+        self._db = None
+        self._path = None
+
+    def _disk(self):
+        if self._db is None:
+            handle, self._path = tempfile.mkstemp(suffix=".sqlite", dir=self.directory)
+            os.close(handle)
+            self._db = sqlite3.connect(self._path)
+            self._db.execute("PRAGMA journal_mode = OFF;")
+            self._db.execute("PRAGMA synchronous = OFF;")
+            self._db.execute("CREATE TABLE seen (key TEXT PRIMARY KEY) WITHOUT ROWID;")
+        return self._db
+
+    def add(self, key):
+        self.memory.add(key)
+        if len(self.memory) >= self.max_items:
+            self.spill()
+
+    def spill(self):
+        """Moves the in-memory keys to disk."""
+        if not self.memory:
+            return
+        db = self._disk()
+        db.executemany("INSERT OR IGNORE INTO seen (key) VALUES (?);",
+                       ((key,) for key in self.memory))
+        db.commit()
+        self.memory.clear()
+
+    def __contains__(self, key):
+        if key in self.memory:
+            return True
+        if self._db is None:
+            return False
+        return self._db.execute(
+            "SELECT 1 FROM seen WHERE key = ?;", (key,)
+        ).fetchone() is not None
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            os.remove(self._path)
+            self._db = None
+
+
+class Deduplicator:
+    """Remembers keys and reports whether each one was seen before."""
+
+    def __init__(self, capacity=10_000_000, error_rate=0.01,
+                 max_items=1_000_000, directory=None):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact = SpillingSet(max_items, directory)
+        self.duplicates = 0
+
+    def seen(self, key):
+        """Returns True if key was seen before, recording it otherwise."""
+        if key in self.bloom and key in self.exact:
+            self.duplicates += 1
+            return True
+        self.bloom.add(key)
+        self.exact.add(key)
+        return False
+
+    def close(self):
+        self.exact.close()
+
+
+def dedupe_rows(rows, key_index=2, **options):
+    """
+    Generator that drops rows whose key (the email by default) already
+    appeared earlier in rows. options are passed to Deduplicator.
+    """
+    deduplicator = Deduplicator(**options)
+    try:
+        for row in rows:
+            if not deduplicator.seen(row[key_index]):
+                yield row
+    finally:
+        deduplicator.close()
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Streaming export of user_data to CSV, JSON Lines or Parquet.
+
+Rows come from stream_users_in_batches as raw tuples and are written one
+batch at a time, so no more than one batch is held in memory.
+
+Usage: ./export_users.py output.csv.gz [batch_size]
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import sys
+import time
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+
+stream_users_in_batches = __import__('1-batch_processing').stream_users_in_batches
+
+FIELDS = ("user_id", "name", "email", "age")
+OPENERS = {None: open, "gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+BUFFER_SIZE = 1 << 20
+
+
+def _open_text(path, compression):
+    """
+    Opens path for text writing, compressed if requested. The file
+    underneath is written through a BUFFER_SIZE buffer either way.
+    Returns (text file, raw file); the raw file is None when closing the
+    text file closes it too.
+    """
+    if compression not in OPENERS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    if compression is None:
+        return open(path, mode="w", encoding="utf-8", newline="",
+                    buffering=BUFFER_SIZE), None
+    raw = open(path, mode="wb", buffering=BUFFER_SIZE)
+    try:
+        return OPENERS[compression](raw, mode="wt", encoding="utf-8", newline=""), raw
+    except Exception:
+        raw.close()
+        raise
+
+
+def _json_value(value):
+    """json.dumps default for the non-JSON types psycopg2 returns."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+
+class TextSink:
+    """Base of the text sinks: owns the (possibly compressed) file."""
+
+    def __init__(self, path, compression=None):
+        self.file, self.raw = _open_text(path, compression)
+
+    def close(self):
+        try:
+            self.file.close()  # flushes the compressor's trailer
+        finally:
+            if self.raw is not None:
+                self.raw.close()
+
+
+class CsvSink(TextSink):
+    """Writes batches as CSV with a header line."""
+
+    def __init__(self, path, compression=None):
+        super().__init__(path, compression)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(FIELDS)
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+
+
+class JsonLinesSink(TextSink):
+    """Writes batches as one JSON object per line."""
+
+    def write_batch(self, rows):
+        self.file.write("".join(
+            json.dumps(dict(zip(FIELDS, row)), default=_json_value) + "\n"
+            for row in rows
+        ))
+
+
+class ParquetSink:
+    """Writes each batch as a Parquet row group."""
+
+    def __init__(self, path, compression="snappy"):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet export")
+        self.schema = pa.schema([
+            ("user_id", pa.string()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("age", pa.int32()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema,
+                                       compression=compression or "none")
+
+    def write_batch(self, rows):
+        user_ids, names, emails, ages = zip(*rows)
+        self.writer.write_table(pa.table({
+            "user_id": [str(user_id) for user_id in user_ids],
+            "name": list(names),
+            "email": list(emails),
+            "age": [int(age) for age in ages],
+        }, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+SINKS = {"csv": CsvSink, "jsonl": JsonLinesSink, "parquet": ParquetSink}
+
+
+def sink_for(path, compression=None):
+    """
+    Picks the sink from the file name, e.g. users.csv, users.jsonl.gz or
+    users.parquet. A .gz, .bz2 or .xz suffix selects the compression of
+    text formats when compression is not given; otherwise each sink
+    uses its own default (none for text, snappy for Parquet).
+    """
+    name = path
+    suffixes = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+    for suffix, codec in suffixes.items():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            compression = compression or codec
+    kind = os.path.splitext(name)[1].lstrip(".")
+    if kind not in SINKS:
+        raise ValueError(f"Unsupported export format: {kind}")
+    if compression is None:
+        return SINKS[kind](path)
+    return SINKS[kind](path, compression)
+
+
+def export_users(sink, path, batch_size=10000):
+    """
+    Streams user_data into sink one batch at a time.
+    Returns (rows, bytes written, seconds).
+    """
+    started = time.perf_counter()
+    rows = 0
+    batch = []
+    try:
+        for row in stream_users_in_batches(batch_size, row_format="tuple"):
+            batch.append(row)
+            if len(batch) == batch_size:
+                sink.write_batch(batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            sink.write_batch(batch)
+            rows += len(batch)
+    finally:
+        sink.close()
+    return rows, os.path.getsize(path), time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "user_data_export.csv"
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    rows, size, elapsed = export_users(sink_for(path), path, batch_size)
+    elapsed = elapsed or 1e-9
+    print(f"Exported {rows} rows ({size} bytes) to {path} in {elapsed:.2f}s: "
+          f"{rows / elapsed:.0f} rows/sec, {size / elapsed:.0f} bytes/sec")
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Incremental change stream for user_data.
+
+seed.create_table maintains an indexed updated_at column. The stream
+walks rows in (updated_at, user_id) order starting after a stored
+watermark, so a sync only reads the rows changed since the last run.
+
+updated_at is the start time of the writing transaction, so a long
+transaction (a bulk COPY, say) can commit rows older than ones already
+streamed. Each run therefore stops short of the oldest transaction
+still open in the database. Seeing other roles' transactions in
+pg_stat_activity needs the pg_read_all_stats role (or superuser);
+without it their rows may be skipped.
+"""
+
+from connection_pool import connect_to_prodev
+from checkpoint import as_checkpoint
+from user_rows import row_builder
+
+# Rows stamped at or after this may still be joined by rows from
+# transactions that have not committed yet
+HORIZON_QUERY = """
+    SELECT LEAST(now(), min(xact_start))
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND backend_type = 'client backend'
+      AND pid <> pg_backend_pid()
+      AND xact_start IS NOT NULL;
+"""
+
+CHANGED_USERS_QUERY = """
+    SELECT user_id, name, email, age, updated_at
+    FROM user_data
+    WHERE (updated_at, user_id) > (%s, %s)
+      AND updated_at < %s
+    ORDER BY updated_at, user_id
+    LIMIT %s;
+"""
+
+# Lower bound used when there is no watermark yet
+EPOCH = ("-infinity", "00000000-0000-0000-0000-000000000000")
+
+
+def _parse_watermark(value):
+    """Splits a stored "updated_at user_id" watermark into its parts."""
+    if not value:
+        return EPOCH
+    updated_at, user_id = value.rsplit(" ", 1)
+    return updated_at, user_id
+
+
+def stream_changed_users(watermark, batch_size=1000, row_format="dict"):
+    """
+    Generator that yields the users inserted or updated since the
+    watermark (a file path or a checkpoint object, see checkpoint.py).
+
+    The watermark advances after every batch the consumer has moved
+    past, so an interrupted sync continues where it stopped. Rows
+    stamped at or after the start of the oldest open transaction are
+    left for the next run, since that transaction may still commit rows
+    that sort before them.
+    """
+    build = row_builder(row_format)
+    watermark = as_checkpoint(watermark)
+    updated_at, user_id = _parse_watermark(watermark.load())
+
+    connection = connect_to_prodev()
+    if not connection:
+        return
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(HORIZON_QUERY)
+        (horizon,) = cursor.fetchone()
+        while True:
+            cursor.execute(
+                CHANGED_USERS_QUERY, (updated_at, user_id, horizon, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield build(row[:4])
+            updated_at, user_id = rows[-1][4].isoformat(), str(rows[-1][0])
+            watermark.save(f"{updated_at} {user_id}")
+            if len(rows) < batch_size:
+                break
+    finally:
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    for user in stream_changed_users("user_data.watermark"):
+        print(user)
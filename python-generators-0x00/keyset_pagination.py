@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Keyset (seek) pagination over the user_data table.
+
+Instead of LIMIT/OFFSET, every page starts right after the last user_id
+seen on the previous page, so the primary key index lets PostgreSQL jump
+straight to the next page and each page costs the same however deep
+into the table it is.
+"""
+
+import time
+
+USER_COLUMNS = "user_id, name, email, age"
+USER_FIELDS = ("user_id", "name", "email", "age")
+SQL_OPERATORS = ("=", "!=", "<", "<=", ">", ">=")
+
+
+def compile_filters(filters):
+    """
+    Compiles declarative (field, operator, value) filters into a SQL
+    condition. Callables (taking a user dict and returning a bool)
+    cannot be expressed in SQL and are handed back to be applied in
+    Python. Returns (condition, params, python_filters).
+    """
+    conditions = []
+    params = []
+    python_filters = []
+    for user_filter in filters or ():
+        if callable(user_filter):
+            python_filters.append(user_filter)
+            continue
+        field, op, value = user_filter
+        if field not in USER_FIELDS:
+            raise ValueError(f"Unknown user_data field: {field}")
+        if op not in SQL_OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        conditions.append(f"{field} {op} %s")
+        params.append(value)
+    return " AND ".join(conditions), tuple(params), python_filters
+
+
+def build_page_query(last_seen, page_size, condition="", params=()):
+    """
+    Builds the keyset query for the page after last_seen (or the first
+    page when it is None), optionally restricted by a SQL condition.
+    Returns (query, params) with %s placeholders.
+    """
+    conditions = [condition] if condition else []
+    if last_seen is not None:
+        conditions.insert(0, "user_id > %s")
+        params = (last_seen,) + tuple(params)
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    query = (
+        f"SELECT {USER_COLUMNS} FROM user_data "
+        f"{where}ORDER BY user_id LIMIT %s;"
+    )
+    return query, tuple(params) + (page_size,)
+
+
+def fetch_page_after(cursor, last_seen, page_size, condition="", params=()):
+    """
+    Fetches up to page_size rows of user_data ordered by user_id,
+    starting after last_seen (or from the beginning when it is None)
+    and matching the optional SQL condition. Returns a list of row tuples.
+    """
+    cursor.execute(*build_page_query(last_seen, page_size, condition, params))
+    return cursor.fetchall()
+
+
+def keyset_pages(connection, page_size, last_seen=None, condition="", params=()):
+    """
+    Generator that yields pages (lists of row tuples) of user_data in
+    user_id order over the given connection, optionally restricted to
+    rows matching a SQL condition from compile_filters.
+    page_size is a number or an AdaptiveBatchSize (see adaptive_batch).
+    """
+    sizer = page_size if hasattr(page_size, "next_size") else None
+    cursor = connection.cursor()
+    try:
+        while True:
+            size = sizer.next_size() if sizer else page_size
+            started = time.perf_counter()
+            rows = fetch_page_after(cursor, last_seen, size, condition, params)
+            if sizer:
+                sizer.record(rows, time.perf_counter() - started)
+            if not rows:
+                break
+            yield rows
+            if len(rows) < size:
+                break
+            last_seen = rows[-1][0]
+    finally:
+        cursor.close()
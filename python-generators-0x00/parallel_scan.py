@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Parallel range-partitioned scan of user_data.
+
+The UUID key space of user_id is split into N contiguous ranges. Each
+range is walked with keyset pagination by a pool of worker processes,
+every worker holding its own connection. Pages come back either in
+user_id order (ordered=True) or as soon as any worker finishes one.
+"""
+
+import os
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from connection_pool import connect_to_prodev
+from keyset_pagination import build_page_query, compile_filters
+
+_connection = None
+
+
+def uuid_ranges(count):
+    """
+    Splits the UUID key space into count contiguous (low, high) ranges.
+    low is inclusive, high exclusive; None means unbounded.
+    """
+    step = (1 << 128) // count
+    edges = [str(uuid.UUID(int=step * i)) for i in range(1, count)]
+    return list(zip([None] + edges, edges + [None]))
+
+
+def _open_worker_connection():
+    """Pool initializer: one connection per worker process."""
+    global _connection
+    _connection = connect_to_prodev()
+
+
+def _scan_page(task):
+    """
+    Worker: fetches the next page of one range.
+    Returns (page or map_page(page), last user_id or None when done).
+    """
+    low, high, last_seen, page_size, condition, params, map_page = task
+    conditions = []
+    bounds = []
+    if low is not None and last_seen is None:
+        conditions.append("user_id >= %s")
+        bounds.append(low)
+    if high is not None:
+        conditions.append("user_id < %s")
+        bounds.append(high)
+    if condition:
+        conditions.append(condition)
+    cursor = _connection.cursor()
+    try:
+        cursor.execute(*build_page_query(
+            last_seen, page_size, " AND ".join(conditions), tuple(bounds) + params
+        ))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    last_key = rows[-1][0] if len(rows) == page_size else None
+    return (map_page(rows) if map_page else rows), last_key
+
+
+def parallel_scan(workers=None, page_size=1000, ordered=False, filters=None,
+                  map_page=None, partitions=None, max_buffered=4):
+    """
+    Generator that yields the pages of user_data read by a process pool.
+
+    - ordered=True yields pages in user_id order, with at most
+      max_buffered pages held for each range that is not being yielded yet;
+      ordered=False yields pages in completion order.
+    - filters are (field, operator, value) tuples pushed into the query.
+    - map_page, a picklable function, runs on each page inside the worker
+      (e.g. a partial aggregate) and its result is yielded instead of the
+      rows, so CPU-bound work is spread over the workers too.
+    - partitions defaults to four ranges per worker.
+    """
+    condition, params, python_filters = compile_filters(filters)
+    if python_filters:
+        raise ValueError("Only SQL filters can be used in a parallel scan")
+    workers = workers or os.cpu_count() or 1
+    ranges = uuid_ranges(partitions or workers * 4)
+
+    def task(index, last_seen):
+        low, high = ranges[index]
+        return (low, high, last_seen, page_size, condition, params, map_page)
+
+    with ProcessPoolExecutor(workers, initializer=_open_worker_connection) as pool:
+        pending = {pool.submit(_scan_page, task(i, None)): i for i in range(len(ranges))}
+
+        if not ordered:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    page, last_key = future.result()
+                    if last_key is not None:
+                        pending[pool.submit(_scan_page, task(index, last_key))] = index
+                    yield page
+            return
+
+        buffers = [deque() for _ in ranges]
+        paused = {}       # range index -> key to resume from
+        finished = set()
+        current = 0
+        while current < len(ranges):
+            if buffers[current]:
+                yield buffers[current].popleft()
+                if current in paused:
+                    key = paused.pop(current)
+                    pending[pool.submit(_scan_page, task(current, key))] = current
+                continue
+            if current in finished:
+                current += 1
+                if current in paused:
+                    key = paused.pop(current)
+                    pending[pool.submit(_scan_page, task(current, key))] = current
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                page, last_key = future.result()
+                buffers[index].append(page)
+                if last_key is None:
+                    finished.add(index)
+                elif index == current or len(buffers[index]) < max_buffered:
+                    pending[pool.submit(_scan_page, task(index, last_key))] = index
+                else:
+                    paused[index] = last_key
+
+
+def _age_totals(rows):
+    """map_page for parallel_average_age: (sum of ages, row count)."""
+    return sum(row[3] for row in rows), len(rows)
+
+
+def parallel_average_age(workers=None, page_size=10000):
+    """Average age of all users, summed page by page in the workers."""
+    total = 0
+    count = 0
+    for page_total, page_count in parallel_scan(workers, page_size,
+                                                map_page=_age_totals):
+        total += page_total
+        count += page_count
+    return total / count if count else 0
+
+
+if __name__ == "__main__":
+    print(f"Average age of users: {parallel_average_age():.2f}")
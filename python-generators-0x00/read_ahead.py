@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Read-ahead (double buffering) for blocking generators.
+"""
+
+import queue
+import threading
+
+_DONE = object()
+
+
+def read_ahead(iterable, depth=1):
+    """
+    Generator that yields the items of iterable while a background
+    thread already pulls up to depth further items from it.
+
+    Exceptions raised by iterable are re-raised to the consumer. When
+    the consumer stops early, the producer is told to stop, iterable is
+    closed on the producer thread and the thread is joined.
+    """
+    items = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+
+    def put(entry):
+        """Blocks until entry is queued; returns False once stopped."""
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as error:
+            put((_DONE, error))
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
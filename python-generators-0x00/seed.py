@@ -4,16 +4,24 @@ import psycopg2
 from psycopg2 import sql
 import uuid
 import csv
+import io
+import math
+import os
+import sys
+import time
+import argparse
+from multiprocessing import Pool
+
+from connection_pool import db_settings
+from dedup import dedupe_rows
 
 
 def connect_db():
     """Connect to PostgreSQL server (default 'postgres' database)."""
     try:
-        connection = psycopg2.connect(
-            host="localhost",
-            user="postgres",      
-            password="findit"
-        )
+        settings = db_settings()
+        settings.pop("database")
+        connection = psycopg2.connect(**settings)
         connection.autocommit = True
         return connection
     except Exception as e:
@@ -22,18 +30,21 @@ def connect_db():
 
 
 def create_database(connection):
-    """Create ALX_prodev database if it does not exist."""
+    """Create the configured database (DB_NAME, ALX_prodev by default) if it does not exist."""
+    name = db_settings()["database"]
     try:
         cursor = connection.cursor()
         cursor.execute(
-            "SELECT 1 FROM pg_catalog.pg_database WHERE datname = 'ALX_prodev';"
+            "SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s;", (name,)
         )
         exists = cursor.fetchone()
         if not exists:
-            cursor.execute("CREATE DATABASE ALX_prodev;")
-            print("Database ALX_prodev created successfully")
+            cursor.execute(
+                sql.SQL("CREATE DATABASE {};").format(sql.Identifier(name))
+            )
+            print(f"Database {name} created successfully")
         else:
-            print("Database ALX_prodev already exists")
+            print(f"Database {name} already exists")
         cursor.close()
     except Exception as e:
         print(f"Error creating database: {e}")
@@ -42,12 +53,7 @@ def create_database(connection):
 def connect_to_prodev():
     """Connect to ALX_prodev database."""
     try:
-        connection = psycopg2.connect(
-            host="localhost",
-            user="postgres",  
-            password="findit",
-            database="ALX_prodev"
-        )
+        connection = psycopg2.connect(**db_settings())
         connection.autocommit = True
         return connection
     except Exception as e:
@@ -64,15 +70,134 @@ def create_table(connection):
                 user_id UUID PRIMARY KEY,
                 name VARCHAR(255) NOT NULL,
                 email VARCHAR(255) NOT NULL UNIQUE,
-                age DECIMAL NOT NULL
+                age INTEGER NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
             );
         """)
+        # Change tracking: updated_at is set on insert and on every update
+        cursor.execute("""
+            ALTER TABLE user_data
+            ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS user_data_updated_at_idx
+            ON user_data (updated_at, user_id);
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION user_data_touch_updated_at()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                NEW.updated_at = now();
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cursor.execute(
+            "DROP TRIGGER IF EXISTS user_data_touch_updated_at ON user_data;"
+        )
+        cursor.execute("""
+            CREATE TRIGGER user_data_touch_updated_at
+            BEFORE UPDATE ON user_data
+            FOR EACH ROW EXECUTE FUNCTION user_data_touch_updated_at();
+        """)
         cursor.close()
         print("Table user_data created successfully")
     except Exception as e:
         print(f"Error creating table: {e}")
 
 
+# Access paths of the generators and the index that serves each one
+ACCESS_PATHS = {
+    "keyset": (
+        "SELECT user_id, name, email, age FROM user_data "
+        "WHERE user_id > '00000000-0000-0000-0000-000000000000' "
+        "ORDER BY user_id LIMIT 1000;",
+        "user_data_pkey",
+    ),
+    "keyset_age_filter": (
+        "SELECT user_id, name, email, age FROM user_data "
+        "WHERE user_id > '00000000-0000-0000-0000-000000000000' AND age > 25 "
+        "ORDER BY user_id LIMIT 1000;",
+        "user_data_pkey",
+    ),
+    "age_range": (
+        "SELECT user_id, name, email, age FROM user_data "
+        "WHERE age BETWEEN 30 AND 40;",
+        "user_data_age_idx",
+    ),
+}
+
+
+def provision_schema(connection):
+    """
+    Brings user_data up to the schema the generators expect: an integer
+    age column and a covering index for age ranges, so they can be
+    answered from the index alone. Keyset scans by user_id use the
+    primary key; a covering copy of it would duplicate the whole table
+    and be maintained on every write, so it is dropped if present.
+    """
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'user_data' AND column_name = 'age';
+        """)
+        row = cursor.fetchone()
+        if row and row[0] != "integer":
+            cursor.execute("""
+                ALTER TABLE user_data
+                ALTER COLUMN age TYPE INTEGER USING round(age)::integer;
+            """)
+        cursor.execute("DROP INDEX IF EXISTS user_data_keyset_idx;")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS user_data_age_idx
+            ON user_data (age) INCLUDE (user_id, name, email);
+        """)
+        cursor.execute("ANALYZE user_data;")
+        cursor.close()
+        print("Schema for user_data provisioned successfully")
+    except Exception as e:
+        print(f"Error provisioning schema: {e}")
+
+
+def _plan_nodes(plan):
+    """Yields every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def check_query_plans(connection):
+    """
+    Runs EXPLAIN on each generator access path and reports whether the
+    planner uses the index meant for it. Returns a dict mapping each
+    access path to True/False. On small tables a sequential scan can
+    legitimately win, so seed a realistic row count before relying on it.
+    The table is vacuumed and analyzed first: without a visibility map
+    the planner cannot count on index-only scans.
+    """
+    results = {}
+    autocommit = connection.autocommit
+    connection.autocommit = True  # VACUUM cannot run inside a transaction
+    cursor = connection.cursor()
+    try:
+        cursor.execute("VACUUM (ANALYZE) user_data;")
+    finally:
+        connection.autocommit = autocommit
+    for name, (query, index) in ACCESS_PATHS.items():
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {query}")
+        plan = cursor.fetchone()[0][0]["Plan"]
+        nodes = list(_plan_nodes(plan))
+        used = [node.get("Index Name") for node in nodes if "Index Name" in node]
+        results[name] = index in used
+        scans = ", ".join(f"{node['Node Type']} {node.get('Index Name', '')}".strip()
+                          for node in nodes if "Scan" in node["Node Type"])
+        status = "OK" if results[name] else "MISSING INDEX"
+        print(f"{name}: {status} ({scans})")
+    cursor.close()
+    return results
+
+
 def insert_data(connection, csv_file):
     """Insert data from CSV into user_data table."""
     try:
@@ -98,3 +223,323 @@ def insert_data(connection, csv_file):
         print("Data inserted successfully")
     except Exception as e:
         print(f"Error inserting data: {e}")
+
+
+def _to_user_row(row):
+    """Builds a (user_id, name, email, age) tuple from a CSV row dict."""
+    return (str(uuid.uuid4()), row["name"], row["email"], int(row["age"]))
+
+
+def read_users_csv(csv_file):
+    """
+    Generator that yields (user_id, name, email, age) tuples from the CSV,
+    with a freshly generated user_id for each row.
+    """
+    with open(csv_file, mode="r", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            yield _to_user_row(row)
+
+
+class CopyStream:
+    """
+    File-like object that serialises rows as CSV on demand, so
+    COPY ... FROM STDIN can stream them without building the whole
+    payload in memory.
+    """
+
+    def __init__(self, rows, rows_per_chunk=1000):
+        self._rows = iter(rows)
+        self._rows_per_chunk = rows_per_chunk
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.row_count = 0
+
+    def _fill(self):
+        """Serialises the next chunk of rows; returns False when drained."""
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        for _ in range(self._rows_per_chunk):
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self.row_count += 1
+        chunk = self._buffer.getvalue()
+        self._pending += chunk
+        return bool(chunk)
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            if not self._fill():
+                break
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def copy_users(connection, rows):
+    """
+    Loads (user_id, name, email, age) rows through COPY into a staging
+    table, then merges them into user_data. Rows whose email already
+    exists, in the table or earlier in the input, are skipped.
+    Returns (rows copied, rows inserted into user_data).
+    """
+    autocommit = connection.autocommit
+    connection.autocommit = False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TEMP TABLE user_data_staging (
+                    line BIGSERIAL,
+                    user_id UUID NOT NULL,
+                    name VARCHAR(255) NOT NULL,
+                    email VARCHAR(255) NOT NULL,
+                    age INTEGER NOT NULL
+                ) ON COMMIT DROP;
+            """)
+            stream = CopyStream(rows)
+            cursor.copy_expert(
+                "COPY user_data_staging (user_id, name, email, age) "
+                "FROM STDIN WITH (FORMAT csv);",
+                stream
+            )
+            # Ordering by line keeps the first occurrence of an email
+            cursor.execute("""
+                INSERT INTO user_data (user_id, name, email, age)
+                SELECT user_id, name, email, age
+                FROM user_data_staging
+                ORDER BY line
+                ON CONFLICT (email) DO NOTHING;
+            """)
+            inserted = cursor.rowcount
+        connection.commit()
+        return stream.row_count, inserted
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.autocommit = autocommit
+
+
+# Headroom over the estimated row count when sizing the Bloom filter
+ESTIMATE_MARGIN = 1.2
+
+
+def estimate_rows(csv_file, start=None, end=None, sample_lines=1000):
+    """
+    Estimates the number of records in csv_file (or in the byte range
+    start..end of its body) from the average length of its first
+    sample_lines lines. Used to size the dedup Bloom filter.
+    """
+    with open(csv_file, mode="rb") as file:
+        file.readline()  # header
+        body_start = file.tell()
+        lengths = [len(line) for _, line in zip(range(sample_lines), file)]
+    if not lengths:
+        return 0
+    start = body_start if start is None else start
+    end = os.path.getsize(csv_file) if end is None else end
+    return math.ceil((end - start) / (sum(lengths) / len(lengths)))
+
+
+def _dedupe_capacity(expected_rows):
+    """Bloom filter capacity for about expected_rows keys."""
+    return max(1000, int(expected_rows * ESTIMATE_MARGIN))
+
+
+def bulk_insert_data(connection, csv_file, dedupe=True, expected_rows=None):
+    """
+    Insert data from CSV into user_data table with a single COPY
+    instead of two round trips per row. Duplicate emails are skipped
+    just like insert_data. With dedupe=True duplicates inside the CSV
+    are dropped in-process (see dedup.py) before they reach COPY; the
+    Bloom filter is sized for expected_rows, estimated from the file
+    size when not given.
+    """
+    try:
+        rows = read_users_csv(csv_file)
+        if dedupe:
+            if expected_rows is None:
+                expected_rows = estimate_rows(csv_file)
+            rows = dedupe_rows(rows, capacity=_dedupe_capacity(expected_rows))
+        _, inserted = copy_users(connection, rows)
+        print(f"Data inserted successfully ({inserted} rows)")
+    except Exception as e:
+        print(f"Error inserting data: {e}")
+
+
+def shard_csv(csv_file, shards):
+    """
+    Splits the CSV body (everything after the header) into at most
+    shards byte ranges whose edges fall on line boundaries.
+    Returns the header fields and a list of (start, end) offsets.
+    Records must not contain embedded newlines.
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, mode="rb") as file:
+        header = file.readline()
+        body_start = file.tell()
+        edges = [body_start]
+        for i in range(1, shards):
+            file.seek(max(body_start + (size - body_start) * i // shards, edges[-1]))
+            if file.tell() > body_start:
+                file.readline()  # move to the start of the next line
+            edges.append(max(file.tell(), edges[-1]))
+        edges.append(size)
+
+    fields = next(csv.reader([header.decode("utf-8")]))
+    ranges = [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+    return fields, ranges
+
+
+def read_users_shard(csv_file, fields, start, end):
+    """
+    Generator that yields (user_id, name, email, age) tuples for the
+    lines of csv_file between byte offsets start and end.
+    """
+    with open(csv_file, mode="rb") as file:
+        file.seek(start)
+        for row in csv.DictReader(_until_offset(file, end), fieldnames=fields):
+            yield _to_user_row(row)
+
+
+def _until_offset(file, end):
+    """Yields decoded lines from file until its position reaches end."""
+    while file.tell() < end:
+        line = file.readline()
+        if not line:
+            break
+        yield line.decode("utf-8")
+
+
+def _stage_shard(task):
+    """
+    Pool worker: COPYs one shard over its own connection into the shared
+    staging table, tagging every row with its shard and line number.
+    Returns the number of rows copied.
+    """
+    csv_file, fields, start, end, expected_rows, shard, staging = task
+    connection = connect_to_prodev()
+    if not connection:
+        raise RuntimeError("could not connect to ALX_prodev")
+    try:
+        rows = dedupe_rows(read_users_shard(csv_file, fields, start, end),
+                           capacity=_dedupe_capacity(expected_rows))
+        stream = CopyStream(
+            (shard, line) + row for line, row in enumerate(rows)
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                sql.SQL(
+                    "COPY {} (shard, line, user_id, name, email, age) "
+                    "FROM STDIN WITH (FORMAT csv);"
+                ).format(sql.Identifier(staging)),
+                stream
+            )
+        connection.commit()
+        return stream.row_count
+    finally:
+        connection.close()
+
+
+def parallel_insert_data(csv_file, workers=None, expected_rows=None):
+    """
+    Insert data from CSV into user_data table using several processes.
+    The file is split into line-aligned byte ranges; each worker parses
+    its range, generates the UUIDs and COPYs it over its own connection
+    into one shared UNLOGGED staging table. A single INSERT ... SELECT
+    then merges the staging table in file order, so of several rows
+    with the same email the first one in the file is kept, and workers
+    never wait on each other's uncommitted rows. If any shard fails,
+    nothing is merged. Each shard's dedup filter is sized for its share
+    of expected_rows (estimated from the file size when not given).
+    """
+    workers = workers or os.cpu_count() or 1
+    staging = f"user_data_load_{uuid.uuid4().hex[:12]}"
+    connection = connect_to_prodev()
+    if not connection:
+        print("Error inserting data: could not connect to ALX_prodev")
+        return
+    try:
+        fields, ranges = shard_csv(csv_file, workers)
+        body = sum(end - start for start, end in ranges) or 1
+        tasks = [
+            (csv_file, fields, start, end,
+             estimate_rows(csv_file, start, end) if expected_rows is None
+             else math.ceil(expected_rows * (end - start) / body),
+             shard, staging)
+            for shard, (start, end) in enumerate(ranges)
+        ]
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(sql.SQL("""
+                CREATE UNLOGGED TABLE {} (
+                    shard INTEGER NOT NULL,
+                    line BIGINT NOT NULL,
+                    user_id UUID NOT NULL,
+                    name VARCHAR(255) NOT NULL,
+                    email VARCHAR(255) NOT NULL,
+                    age INTEGER NOT NULL
+                );
+            """).format(sql.Identifier(staging)))
+        with Pool(processes=min(workers, len(tasks) or 1)) as pool:
+            rows = sum(pool.map(_stage_shard, tasks))
+        with connection.cursor() as cursor:
+            cursor.execute(sql.SQL("""
+                INSERT INTO user_data (user_id, name, email, age)
+                SELECT user_id, name, email, age
+                FROM {}
+                ORDER BY shard, line
+                ON CONFLICT (email) DO NOTHING;
+            """).format(sql.Identifier(staging)))
+            inserted = cursor.rowcount
+        elapsed = time.perf_counter() - started
+
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"Data inserted successfully ({inserted} of {rows} rows "
+              f"in {elapsed:.2f}s, {rate:.0f} rows/sec, "
+              f"{len(tasks)} workers)")
+    except Exception as e:
+        print(f"Error inserting data: {e}")
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL("DROP TABLE IF EXISTS {};").format(sql.Identifier(staging))
+            )
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed ALX_prodev.user_data")
+    parser.add_argument("csv_file", nargs="?", default="user_data.csv")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of ingest processes (default: 1)")
+    parser.add_argument("--expected-rows", type=int, metavar="ROWS",
+                        help="approximate number of records, used to size "
+                             "deduplication (default: estimated from the file)")
+    args = parser.parse_args()
+
+    connection = connect_db()
+    if not connection:
+        sys.exit(1)
+    create_database(connection)
+    connection.close()
+
+    connection = connect_to_prodev()
+    if not connection:
+        sys.exit(1)
+    create_table(connection)
+    provision_schema(connection)
+    if args.workers > 1:
+        connection.close()
+        parallel_insert_data(args.csv_file, args.workers, args.expected_rows)
+        connection = connect_to_prodev()
+    else:
+        bulk_insert_data(connection, args.csv_file, expected_rows=args.expected_rows)
+    check_query_plans(connection)
+    connection.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Unit tests for checkpoints and resumable batch streaming."""
+
+import itertools
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+from checkpoint import FileCheckpoint, as_checkpoint
+
+batch_processing = __import__('1-batch_processing')
+
+ROWS = [(f"{i:04d}", f"User {i}", f"user{i}@example.com", 20 + i % 50)
+        for i in range(237)]
+
+
+class FakeCursor:
+    """Answers the keyset page queries from ROWS."""
+
+    def execute(self, query, params):
+        """Run a build_page_query query against ROWS."""
+        last_seen = params[0] if "user_id > %s" in query else None
+        self.rows = [row for row in ROWS
+                     if last_seen is None or row[0] > last_seen][:params[-1]]
+
+    def fetchall(self):
+        """Return the page selected by execute."""
+        return self.rows
+
+    def close(self):
+        """Nothing to release."""
+
+
+class FakeConnection:
+    """Connection stand-in handing out FakeCursors."""
+
+    closed = False
+
+    def cursor(self):
+        """Return a new FakeCursor."""
+        return FakeCursor()
+
+    def close(self):
+        """Remember that the stream closed its connection."""
+        self.closed = True
+
+
+class TestFileCheckpoint(unittest.TestCase):
+    """Unit tests for FileCheckpoint."""
+
+    def setUp(self):
+        """Point a checkpoint at a fresh temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "job.checkpoint")
+
+    def test_load_without_file(self):
+        """Test a missing checkpoint loads as None."""
+        self.assertIsNone(FileCheckpoint(self.path).load())
+
+    def test_save_load_clear(self):
+        """Test the last saved key is loaded back until cleared."""
+        checkpoint = FileCheckpoint(self.path)
+        checkpoint.save("0049")
+        checkpoint.save("0099")
+        self.assertEqual(FileCheckpoint(self.path).load(), "0099")
+        self.assertEqual(os.listdir(self.directory.name), ["job.checkpoint"])
+        checkpoint.clear()
+        self.assertFalse(os.path.exists(self.path))
+        checkpoint.clear()  # clearing twice is fine
+
+    @parameterized.expand([(None,), ("path",), ("object",)])
+    def test_as_checkpoint(self, kind):
+        """Test paths are wrapped and checkpoint objects kept as they are."""
+        existing = FileCheckpoint(self.path)
+        value = {None: None, "path": self.path, "object": existing}[kind]
+        result = as_checkpoint(value)
+        if kind == "path":
+            self.assertIsInstance(result, FileCheckpoint)
+            self.assertEqual(result.path, self.path)
+        else:
+            self.assertIs(result, value)
+
+
+class TestResumableBatches(unittest.TestCase):
+    """Unit tests for stream_users_in_batches checkpointing."""
+
+    def setUp(self):
+        """Serve the stream from a fake connection."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "batches.checkpoint")
+        patcher = patch.object(batch_processing, "connect_to_prodev", FakeConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self, **options):
+        """stream_users_in_batches over ROWS in batches of 50 tuples."""
+        return batch_processing.stream_users_in_batches(
+            50, row_format="tuple", checkpoint=self.path, **options
+        )
+
+    def test_interrupted_run_resumes_after_last_finished_batch(self):
+        """Test a crash after 120 rows resumes at row 100 and then clears."""
+        users = self.stream()
+        consumed = list(itertools.islice(users, 120))
+        users.close()
+        self.assertEqual(consumed, ROWS[:120])
+        # batches 1 and 2 were moved past; batch 3 was still in progress
+        self.assertEqual(FileCheckpoint(self.path).load(), ROWS[99][0])
+
+        resumed = list(self.stream(resume=True))
+        self.assertEqual(resumed, ROWS[100:])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_checkpoint_every(self):
+        """Test only every checkpoint_every-th batch is recorded."""
+        users = self.stream(checkpoint_every=2)
+        list(itertools.islice(users, 151))
+        users.close()
+        self.assertEqual(FileCheckpoint(self.path).load(), ROWS[99][0])
+
+    def test_without_resume_starts_over(self):
+        """Test a stored checkpoint is ignored unless resume=True."""
+        FileCheckpoint(self.path).save(ROWS[99][0])
+        self.assertEqual(list(self.stream()), ROWS)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_no_checkpoint_before_first_batch_is_done(self):
+        """Test nothing is saved while the first batch is being consumed."""
+        users = self.stream()
+        list(itertools.islice(users, 50))
+        users.close()
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Unit tests for the dedup module and the seed row estimate."""
+
+import os
+import tempfile
+import unittest
+from parameterized import parameterized
+from dedup import BloomFilter, Deduplicator, SpillingSet, dedupe_rows
+from seed import estimate_rows
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Unit tests for BloomFilter."""
+
+    def test_no_false_negatives(self):
+        """Test every added key is reported as present."""
+        bloom = BloomFilter(1000)
+        keys = [f"user{i}@example.com" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    @parameterized.expand([(0.01,), (0.05,)])
+    def test_false_positive_rate(self, error_rate):
+        """Test the false positive rate stays near error_rate at capacity."""
+        bloom = BloomFilter(5000, error_rate)
+        for i in range(5000):
+            bloom.add(f"in{i}")
+        false_positives = sum(f"out{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, error_rate * 2)
+
+    def test_sized_from_capacity(self):
+        """Test a larger capacity gets a larger bit array."""
+        self.assertGreater(BloomFilter(10000).size, BloomFilter(100).size)
+
+
+class TestSpillingSet(unittest.TestCase):
+    """Unit tests for SpillingSet."""
+
+    def test_spills_to_disk(self):
+        """Test keys stay members after being moved to disk."""
+        with tempfile.TemporaryDirectory() as directory:
+            keys = SpillingSet(max_items=10, directory=directory)
+            for i in range(25):
+                keys.add(f"k{i}")
+            self.assertLess(len(keys.memory), 10)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertTrue(all(f"k{i}" in keys for i in range(25)))
+            self.assertNotIn("k25", keys)
+            keys.close()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_stays_in_memory_below_limit(self):
+        """Test no file is created while under max_items."""
+        keys = SpillingSet(max_items=10)
+        keys.add("a")
+        self.assertIn("a", keys)
+        self.assertIsNone(keys._db)
+        keys.close()
+
+
+class TestDeduplicator(unittest.TestCase):
+    """Unit tests for Deduplicator and dedupe_rows."""
+
+    def test_dedupe_rows_keeps_first_occurrence(self):
+        """Test later rows with a seen email are dropped."""
+        rows = [(1, "a", "a@x", 1), (2, "b", "b@x", 2),
+                (3, "a2", "a@x", 3), (4, "B", "B@x", 4)]
+        kept = list(dedupe_rows(rows, capacity=100, max_items=2))
+        self.assertEqual([row[0] for row in kept], [1, 2, 4])
+
+    def test_counts_duplicates_despite_false_positives(self):
+        """Test a saturated Bloom filter still gives exact answers."""
+        deduplicator = Deduplicator(capacity=10, max_items=50)
+        seen = [deduplicator.seen(f"k{i % 300}") for i in range(600)]
+        self.assertEqual(seen.count(False), 300)
+        self.assertEqual(deduplicator.duplicates, 300)
+        deduplicator.close()
+
+
+class TestEstimateRows(unittest.TestCase):
+    """Unit tests for seed.estimate_rows."""
+
+    def setUp(self):
+        """Write a CSV of 2000 equally long records."""
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, mode="w", encoding="utf-8") as file:
+            file.write("name,email,age\n")
+            for i in range(2000):
+                file.write(f"User {i:05d},user{i:05d}@example.com,30\n")
+
+    def tearDown(self):
+        """Remove the CSV."""
+        os.remove(self.path)
+
+    def test_whole_file(self):
+        """Test the estimate matches a file of uniform lines."""
+        self.assertEqual(estimate_rows(self.path), 2000)
+
+    def test_byte_range(self):
+        """Test a byte range is estimated from its own length."""
+        size = os.path.getsize(self.path)
+        with open(self.path, mode="rb") as file:
+            start = len(file.readline())
+            line = len(file.readline())
+        self.assertEqual(estimate_rows(self.path, start, start + 10 * line), 10)
+        self.assertEqual(estimate_rows(self.path, size - line, size), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Unit tests for the keyset_pagination query builders."""
+
+import unittest
+from parameterized import parameterized
+from keyset_pagination import build_page_query, compile_filters
+
+
+class TestCompileFilters(unittest.TestCase):
+    """Unit tests for compile_filters."""
+
+    def test_no_filters(self):
+        """Test None and [] compile to an empty condition."""
+        self.assertEqual(compile_filters(None), ("", (), []))
+        self.assertEqual(compile_filters([]), ("", (), []))
+
+    def test_sql_filters_keep_their_order(self):
+        """Test conditions and params line up in the order given."""
+        condition, params, python_filters = compile_filters(
+            [("age", ">", 25), ("email", "!=", "a@x"), ("age", "<=", 60)]
+        )
+        self.assertEqual(condition, "age > %s AND email != %s AND age <= %s")
+        self.assertEqual(params, (25, "a@x", 60))
+        self.assertEqual(python_filters, [])
+
+    def test_callables_are_applied_in_python(self):
+        """Test callable filters are handed back instead of compiled."""
+        keep = lambda user: user["name"].startswith("A")  # noqa: E731
+        condition, params, python_filters = compile_filters(
+            [keep, ("age", "=", 30)]
+        )
+        self.assertEqual((condition, params), ("age = %s", (30,)))
+        self.assertEqual(python_filters, [keep])
+
+    @parameterized.expand([
+        (("password", "=", "x"),),
+        (("age; DROP TABLE user_data; --", "=", 1),),
+        (("age", "LIKE", "%"),),
+        (("age", "= 1 OR 1 =", 1),),
+    ])
+    def test_unknown_fields_and_operators_are_rejected(self, user_filter):
+        """Test only whitelisted fields and operators reach the SQL."""
+        with self.assertRaises(ValueError):
+            compile_filters([user_filter])
+
+    def test_values_are_never_inlined(self):
+        """Test values travel as parameters, not SQL text."""
+        condition, params, _ = compile_filters([("name", "=", "x' OR '1'='1")])
+        self.assertEqual(condition, "name = %s")
+        self.assertEqual(params, ("x' OR '1'='1",))
+
+
+class TestBuildPageQuery(unittest.TestCase):
+    """Unit tests for build_page_query."""
+
+    def test_first_page(self):
+        """Test the first page has no WHERE clause."""
+        query, params = build_page_query(None, 100)
+        self.assertEqual(
+            query,
+            "SELECT user_id, name, email, age FROM user_data "
+            "ORDER BY user_id LIMIT %s;",
+        )
+        self.assertEqual(params, (100,))
+
+    def test_next_page(self):
+        """Test later pages seek past last_seen."""
+        query, params = build_page_query("id-9", 100)
+        self.assertIn("WHERE user_id > %s ORDER BY user_id LIMIT %s;", query)
+        self.assertEqual(params, ("id-9", 100))
+
+    def test_first_page_with_filters(self):
+        """Test a pushed-down condition alone forms the WHERE clause."""
+        query, params = build_page_query(None, 10, "age > %s", (25,))
+        self.assertIn("WHERE age > %s ORDER BY", query)
+        self.assertEqual(params, (25, 10))
+
+    def test_next_page_with_filters(self):
+        """Test last_seen, filter params and page size follow the placeholders."""
+        condition, filter_params, _ = compile_filters(
+            [("age", ">", 25), ("email", "!=", "a@x")]
+        )
+        query, params = build_page_query("id-9", 10, condition, filter_params)
+        self.assertIn(
+            "WHERE user_id > %s AND age > %s AND email != %s "
+            "ORDER BY user_id LIMIT %s;",
+            query,
+        )
+        self.assertEqual(params, ("id-9", 25, "a@x", 10))
+        self.assertEqual(query.count("%s"), len(params))
+
+    def test_params_may_be_a_list(self):
+        """Test list params are accepted and returned as a tuple."""
+        _, params = build_page_query("id-9", 10, "age > %s", [25])
+        self.assertEqual(params, ("id-9", 25, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
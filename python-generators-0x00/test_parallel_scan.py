@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Unit tests for the parallel_scan module."""
+
+import random
+import threading
+import time
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from parameterized import parameterized
+import parallel_scan
+from parallel_scan import parallel_scan as scan, uuid_ranges
+
+
+class FakeTable:
+    """In-memory user_data standing in for the worker's _scan_page."""
+
+    def __init__(self, count, partitions):
+        rng = random.Random(count)
+        self.rows = sorted(
+            (str(uuid.UUID(int=rng.getrandbits(128))), f"User {i}", "", 20 + i % 50)
+            for i in range(count)
+        )
+        self.ranges = uuid_ranges(partitions)
+        self.fetched = [0] * partitions
+        self.lock = threading.Lock()
+
+    def scan_page(self, task):
+        """Same contract as parallel_scan._scan_page, in a thread."""
+        low, high, last_seen, page_size, _, _, map_page = task
+        with self.lock:
+            self.fetched[self.ranges.index((low, high))] += 1
+        time.sleep(random.random() / 1000)  # shuffle completion order
+        rows = [
+            row for row in self.rows
+            if (low is None or row[0] >= low)
+            and (high is None or row[0] < high)
+            and (last_seen is None or row[0] > last_seen)
+        ][:page_size]
+        last_key = rows[-1][0] if len(rows) == page_size else None
+        return (map_page(rows) if map_page else rows), last_key
+
+
+def thread_executor(workers, initializer=None):
+    """ProcessPoolExecutor stand-in; the fake table needs no connection."""
+    return ThreadPoolExecutor(workers)
+
+
+class TestParallelScan(unittest.TestCase):
+    """Unit tests for parallel_scan, with threads in place of processes."""
+
+    def run_scan(self, table, **options):
+        """Run parallel_scan over table and collect the pages."""
+        with patch.object(parallel_scan, "ProcessPoolExecutor", thread_executor), \
+                patch.object(parallel_scan, "_scan_page", table.scan_page):
+            return list(scan(**options))
+
+    def test_uuid_ranges_cover_key_space(self):
+        """Test the ranges are contiguous and unbounded at both ends."""
+        ranges = uuid_ranges(4)
+        self.assertEqual(ranges[0][0], None)
+        self.assertEqual(ranges[-1][1], None)
+        for (_, high), (low, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(high, low)
+
+    @parameterized.expand([(1,), (7,), (50,)])
+    def test_ordered_scan_yields_rows_in_key_order(self, page_size):
+        """Test ordered=True returns every row once in user_id order."""
+        table = FakeTable(300, partitions=6)
+        pages = self.run_scan(table, workers=3, page_size=page_size,
+                              ordered=True, partitions=6)
+        rows = [row for page in pages for row in page]
+        self.assertEqual(rows, table.rows)
+
+    def test_unordered_scan_yields_every_row(self):
+        """Test ordered=False returns every row once, in any order."""
+        table = FakeTable(300, partitions=6)
+        pages = self.run_scan(table, workers=3, page_size=20, partitions=6)
+        self.assertEqual(sorted(row for page in pages for row in page), table.rows)
+
+    @parameterized.expand([(1,), (2,), (4,)])
+    def test_ordered_scan_bounds_buffered_pages(self, max_buffered):
+        """Test ranges ahead of the current one stop at max_buffered pages."""
+        table = FakeTable(400, partitions=4)
+        yielded = [0] * 4
+        worst = 0
+        with patch.object(parallel_scan, "ProcessPoolExecutor", thread_executor), \
+                patch.object(parallel_scan, "_scan_page", table.scan_page):
+            for page in scan(workers=4, page_size=5, ordered=True,
+                             partitions=4, max_buffered=max_buffered):
+                index = next(i for i, (low, high) in enumerate(table.ranges)
+                             if (low is None or page[0][0] >= low)
+                             and (high is None or page[0][0] < high))
+                yielded[index] += 1
+                with table.lock:
+                    ahead = [table.fetched[i] - yielded[i]
+                             for i in range(index + 1, 4)]
+                worst = max([worst] + ahead)
+        self.assertLessEqual(worst, max_buffered)
+
+    def test_map_page_results_are_yielded(self):
+        """Test map_page output replaces the rows."""
+        table = FakeTable(120, partitions=3)
+        totals = self.run_scan(table, workers=2, page_size=25, ordered=True,
+                               partitions=3, map_page=parallel_scan._age_totals)
+        self.assertEqual(sum(count for _, count in totals), 120)
+        self.assertEqual(sum(total for total, _ in totals),
+                         sum(row[3] for row in table.rows))
+
+    def test_python_filters_are_rejected(self):
+        """Test filters that cannot be pushed into SQL raise ValueError."""
+        with self.assertRaises(ValueError):
+            list(scan(filters=[lambda user: True]))
+
+
+if __name__ == "__main__":
+    unittest.main()
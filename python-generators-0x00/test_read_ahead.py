@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Unit tests for the read_ahead module."""
+
+import threading
+import unittest
+from parameterized import parameterized
+from read_ahead import read_ahead
+
+
+class TestReadAhead(unittest.TestCase):
+    """Unit tests for read_ahead."""
+
+    @parameterized.expand([(0,), (1,), (3,)])
+    def test_yields_items_in_order(self, depth):
+        """Test every item comes through once, in order."""
+        self.assertEqual(list(read_ahead(range(50), depth)), list(range(50)))
+
+    def test_empty_iterable(self):
+        """Test an empty iterable ends the stream at once."""
+        self.assertEqual(list(read_ahead(iter([]))), [])
+
+    def test_reraises_producer_error(self):
+        """Test an exception in the iterable reaches the consumer."""
+        def pages():
+            yield 1
+            raise ValueError("boom")
+
+        stream = read_ahead(pages())
+        self.assertEqual(next(stream), 1)
+        with self.assertRaises(ValueError):
+            next(stream)
+
+    def test_pulls_at_most_depth_ahead(self):
+        """Test the producer blocks once depth items are waiting."""
+        pulled = []
+        blocked = threading.Event()
+
+        def pages():
+            for i in range(10):
+                pulled.append(i)
+                if len(pulled) == 4:
+                    blocked.set()
+                yield i
+
+        stream = read_ahead(pages(), depth=2)
+        self.assertEqual(next(stream), 0)
+        # one item handed out, two queued, one held by the blocked put
+        blocked.wait(1)
+        self.assertLessEqual(len(pulled), 4)
+        stream.close()
+
+    def test_close_stops_and_closes_iterable(self):
+        """Test closing early closes the iterable and joins the thread."""
+        closed = threading.Event()
+
+        def pages():
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.set()
+
+        before = threading.active_count()
+        stream = read_ahead(pages(), depth=1)
+        next(stream)
+        stream.close()
+        self.assertTrue(closed.is_set())
+        self.assertEqual(threading.active_count(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
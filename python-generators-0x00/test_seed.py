@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Unit tests for the CSV sharding and COPY streaming helpers of seed."""
+
+import csv
+import io
+import os
+import tempfile
+import unittest
+from parameterized import parameterized
+from seed import CopyStream, read_users_shard, shard_csv
+
+
+class TestShardCsv(unittest.TestCase):
+    """Unit tests for shard_csv and read_users_shard."""
+
+    def setUp(self):
+        """Write a CSV with lines of varying length."""
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        self.rows = [
+            (f"User {i}" + "x" * (i % 7), f"user{i}@example.com", str(18 + i % 60))
+            for i in range(101)
+        ]
+        with os.fdopen(handle, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(("name", "email", "age"))
+            writer.writerows(self.rows)
+
+    def tearDown(self):
+        """Remove the CSV."""
+        os.remove(self.path)
+
+    def read_all(self, shards):
+        """Read every shard back as (name, email, age) tuples."""
+        fields, ranges = shard_csv(self.path, shards)
+        return fields, ranges, [
+            (name, email, str(age))
+            for start, end in ranges
+            for _, name, email, age in read_users_shard(self.path, fields, start, end)
+        ]
+
+    @parameterized.expand([(1,), (2,), (7,), (101,), (500,)])
+    def test_shards_cover_every_row_once(self, shards):
+        """Test the shards partition the body exactly, in file order."""
+        fields, ranges, rows = self.read_all(shards)
+        self.assertEqual(fields, ["name", "email", "age"])
+        self.assertLessEqual(len(ranges), shards)
+        self.assertEqual(rows, self.rows)
+
+    @parameterized.expand([(3,), (10,)])
+    def test_shard_edges_fall_on_line_starts(self, shards):
+        """Test every range starts at a line start and ranges are contiguous."""
+        _, ranges, _ = self.read_all(shards)
+        with open(self.path, mode="rb") as file:
+            data = file.read()
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+        for start, _ in ranges:
+            self.assertEqual(data[start - 1:start], b"\n")
+        self.assertEqual(ranges[-1][1], len(data))
+
+    def test_header_only_file(self):
+        """Test a CSV without records yields no ranges."""
+        with open(self.path, mode="w", encoding="utf-8") as file:
+            file.write("name,email,age\n")
+        fields, ranges = shard_csv(self.path, 4)
+        self.assertEqual(fields, ["name", "email", "age"])
+        self.assertEqual(ranges, [])
+
+    def test_user_ids_are_generated(self):
+        """Test read_users_shard adds a UUID and converts age to int."""
+        fields, ranges = shard_csv(self.path, 1)
+        user_id, name, _, age = next(read_users_shard(self.path, fields, *ranges[0]))
+        self.assertEqual(len(user_id), 36)
+        self.assertEqual(name, self.rows[0][0])
+        self.assertIsInstance(age, int)
+
+
+class TestCopyStream(unittest.TestCase):
+    """Unit tests for CopyStream."""
+
+    rows = [
+        ("id-1", "Plain", "plain@example.com", 30),
+        ("id-2", "Comma, Name", "comma@example.com", 41),
+        ("id-3", 'Quote "Q"', "quote@example.com", 52),
+    ]
+
+    def expected(self):
+        """The CSV payload the rows should serialise to."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(self.rows)
+        return buffer.getvalue()
+
+    def test_read_all(self):
+        """Test read() without a size returns the whole payload."""
+        stream = CopyStream(self.rows, rows_per_chunk=2)
+        self.assertEqual(stream.read(), self.expected())
+        self.assertEqual(stream.read(), "")
+        self.assertEqual(stream.row_count, 3)
+
+    @parameterized.expand([(1,), (5,), (64,)])
+    def test_read_in_chunks(self, size):
+        """Test sized reads reassemble the payload and end with ''."""
+        stream = CopyStream(self.rows, rows_per_chunk=1)
+        chunks = []
+        while True:
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), size)
+            chunks.append(chunk)
+        self.assertEqual("".join(chunks), self.expected())
+
+    def test_rows_are_consumed_lazily(self):
+        """Test only the rows needed for a read are pulled from the source."""
+        pulled = []
+
+        def rows():
+            for row in self.rows:
+                pulled.append(row)
+                yield row
+
+        stream = CopyStream(rows(), rows_per_chunk=1)
+        stream.read(1)
+        self.assertEqual(len(pulled), 1)
+
+    def test_no_rows(self):
+        """Test an empty source reads as an empty payload."""
+        stream = CopyStream([])
+        self.assertEqual(stream.read(), "")
+        self.assertEqual(stream.row_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
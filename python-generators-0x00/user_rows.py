@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Row representations the user generators can yield.
+
+- "dict":   {"user_id": ..., "name": ..., "email": ..., "age": ...}
+- "record": a UserRow, with user["age"] and user.age access and no
+            per-row __dict__
+- "tuple":  the raw (user_id, name, email, age) tuple from the cursor
+"""
+
+ROW_FORMATS = ("dict", "record", "tuple")
+
+
+class UserRow:
+    """Compact user_data row with the same key access as the dict rows."""
+
+    __slots__ = ("user_id", "name", "email", "age")
+
+    def __init__(self, user_id, name, email, age):
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        self.age = age
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def __eq__(self, other):
+        if not isinstance(other, UserRow):
+            return NotImplemented
+        return all(self[key] == other[key] for key in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={self[key]!r}" for key in self.__slots__)
+        return f"UserRow({fields})"
+
+
+def _to_dict(row):
+    return {"user_id": row[0], "name": row[1], "email": row[2], "age": row[3]}
+
+
+def _to_record(row):
+    return UserRow(*row)
+
+
+def _to_tuple(row):
+    return row
+
+
+def row_builder(row_format):
+    """Returns the function that turns a row tuple into row_format."""
+    builders = {"dict": _to_dict, "record": _to_record, "tuple": _to_tuple}
+    if row_format not in builders:
+        raise ValueError(f"Unknown row format: {row_format}")
+    return builders[row_format]